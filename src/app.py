@@ -3,13 +3,18 @@ from camera_group import CameraGroup
 from level import *
 from ui import *
 from player import Player
+from resolution_scaler import ResolutionScaler
+from timeline import Timeline
 
 import pygame
 
 
 class App:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, resolution=None):
+        # measures each phase of startup
+        self.timeline = Timeline()
+        init(self.timeline)
+
         pygame.display.init()
         pygame.display.set_caption('Novorus')
 
@@ -17,20 +22,43 @@ class App:
         pygame.mouse.set_visible(False)
 
         # sets the size of the screen; defaults to full screen
-        display_info = pygame.display.Info()
-        self.width, self.height = display_info.current_w, display_info.current_h
-        self.resolution = self.width, self.height
+        if HEADLESS:
+            self.width, self.height = resolution or HEADLESS_RESOLUTION
+            self.resolution = self.width, self.height
 
-        self.screen = pygame.display.set_mode(
-            self.resolution,
-            pygame.DOUBLEBUF | pygame.FULLSCREEN
-        )
+            # renders into an offscreen surface without a window
+            self.screen = pygame.display.set_mode(self.resolution)
+
+        else:
+            display_info = pygame.display.Info()
+            self.width, self.height = display_info.current_w, display_info.current_h
+            self.resolution = resolution or (self.width, self.height)
+            self.width, self.height = self.resolution
+
+            self.screen = pygame.display.set_mode(
+                self.resolution,
+                pygame.DOUBLEBUF | pygame.FULLSCREEN
+            )
+
+        self.timeline.mark('display')
+
+        # decodes images before the first floor is built
+        self.preload_assets()
+        self.timeline.mark('image preload')
 
         # ticks and state
         self.events = []
         self.keys_pressed = pygame.key.get_pressed()
 
         self.clock = pygame.time.Clock()
+        self.frame_rate = 0 if HEADLESS else 144
+
+        # the simulation advances in fixed ticks independent of frames
+        self.ticks = 0
+        self.max_frame_time = 250
+
+        # lowers the world resolution when frames take longer than at 60 fps
+        self.resolution_scaler = ResolutionScaler(1000 / 60)
         self.state = {
             'unpaused': True,
             'runtime': True,
@@ -72,49 +100,171 @@ class App:
             self
         )
 
+        self.timeline.mark('app')
+
         # levels and map
         self.level = Level(STARTING_FLOOR, self)
+        self.timeline.mark('first level')
+
+        # screen areas redrawn this frame; None redraws the whole screen
+        self.dirty_rects = None
+        self.overlay_rects = []
 
-    def run(self):
+        # the world is frozen beneath the menu while paused
+        self.paused_frame = None
+
+        if STARTUP_REPORT:
+            print(self.timeline.report())
+
+    def run(self, max_frames=None):
         pygame.event.set_allowed((pygame.QUIT, pygame.MOUSEWHEEL))
 
+        frames = 0
+        accumulator = 0
+        self.clock.tick()
+
         while self.state['runtime']:
+            # stops after a number of frames for benchmarks and soak tests
+            if max_frames is not None and frames >= max_frames:
+                break
+
+            frames += 1
+
             # event handling
-            self.events = pygame.event.get()
+            # events are kept until a tick handles them
+            events = pygame.event.get()
+            self.events.extend(events)
             self.keys_pressed = pygame.key.get_pressed()
 
             # checks for quit event
-            for event in self.events:
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.state['runtime'] = False
 
-            self.draw()
-            self.update()
+            # runs every tick that has elapsed since the last frame
+            # frame time is capped so slow frames do not snowball
+            accumulator += min(
+                self.clock.tick(self.frame_rate),
+                self.max_frame_time
+            )
+
+            while accumulator >= TICK_DURATION:
+                self.update()
+                accumulator -= TICK_DURATION
+
+            # draws between the last two ticks
+            self.draw(accumulator / TICK_DURATION)
 
             # updates screen
-            pygame.display.update()
-            self.clock.tick(60)
-            
+            pygame.display.update(self.dirty_rects)
+
+            # measures the frame without time spent waiting for the next tick
+            if self.resolution_scaler.update(self.clock.get_rawtime()):
+                self.camera_group.set_render_scale(
+                    self.resolution_scaler.scale
+                )
+
+        if FORMAT_REPORT:
+            print(self.camera_group.render_queue.report())
 
         # closes pygame application
         pygame.font.quit()
         pygame.display.quit()
         pygame.quit()
 
-    def draw(self):
-        '''Redraws sprites, images, and surfaces'''
+    def preload_assets(self):
+        '''Decodes images in worker threads while drawing the loading progress'''
+        last_drawn = 0
+
+        def draw_progress(loaded, total):
+            nonlocal last_drawn
+
+            # redraws at most once per frame at 60 fps
+            if loaded < total and pygame.time.get_ticks() - last_drawn < 1000 / 60:
+                return
+
+            last_drawn = pygame.time.get_ticks()
+            self.draw_loading_screen(loaded / total)
+
+        self.draw_loading_screen(0)
+        report = IMAGES.preload(progress=draw_progress)
 
-        # fills a surface with green
-        self.screen.fill(Color.GRASS_GREEN)
+        if STARTUP_REPORT and report['images']:
+            print(
+                f"decoded {report['images']} images "
+                f"({report['bytes'] / 2 ** 20:.1f} MiB) "
+                f"in {report['seconds'] * 1000:.0f} ms "
+                f"at {report['images'] / report['seconds']:.0f} images/s "
+                f"on {report['workers']} threads"
+            )
 
-        self.camera_group.render(
-            show_hitboxes=False,
-            show_collision_boxes=False,
-            show_rects=False
+    def draw_loading_screen(self, progress: float):
+        '''Draws a progress bar in the middle of the screen'''
+        pygame.event.pump()
+        self.screen.fill(Color.BLACK)
+
+        text = COMICORO[50].render('Loading...', True, Color.WHITE)
+        text_rect = text.get_rect(
+            midbottom=(self.width / 2, self.height / 2 - 10)
         )
 
-        self.player_health_bar.render()
-        self.player_mana_bar.render()
+        self.screen.blit(text, text_rect)
+
+        # draws the bar frame and its filled portion
+        bar_rect = pygame.Rect(0, 0, TILE_SIZE * 4, HALF_TILE_SIZE / 2)
+        bar_rect.midtop = self.width / 2, self.height / 2 + 10
+
+        pygame.draw.rect(
+            self.screen,
+            Color.GOLD,
+            (*bar_rect.topleft, bar_rect.width * progress, bar_rect.height)
+        )
+
+        pygame.draw.rect(self.screen, Color.WHITE, bar_rect, 2)
+        pygame.display.update()
+
+    def simulate(self, ticks: int):
+        '''Runs ticks as fast as possible without drawing'''
+        for i in range(ticks):
+            self.update()
+
+    def get_ticks(self) -> float:
+        '''Returns the milliseconds of simulated time'''
+        return self.ticks * TICK_DURATION
+
+    def draw(self, interpolation=1.0):
+        '''Redraws sprites, images, and surfaces'''
+        paused = self.menu.pause_button.active
+        world_frozen = (
+            self.paused_frame
+            and paused
+            and not self.level.transitioning
+            and not self.player.inventory.inventory_button.active
+        )
+
+        if world_frozen:
+            self.screen.blit(self.paused_frame, (0, 0))
+
+        else:
+            # fills a surface with green
+            self.screen.fill(Color.GRASS_GREEN)
+
+            self.camera_group.render(
+                interpolation,
+                show_hitboxes=False,
+                show_collision_boxes=False,
+                show_rects=False
+            )
+
+            self.paused_frame = None
+            if paused:
+                self.paused_frame = self.screen.copy()
+
+        hud_rects = [
+            self.player_health_bar.render(),
+            self.player_mana_bar.render()
+        ]
+
         self.player.inventory.render()
         self.player.spells.render()
 
@@ -122,6 +272,34 @@ class App:
         self.cursor_group.draw(self.screen)
         self.level.render()
 
+        # only the hud and overlays can change over a frozen world
+        overlay_rects = self.get_overlay_rects()
+        if world_frozen:
+            self.dirty_rects = [rect for rect in hud_rects if rect] \
+                + self.overlay_rects \
+                + overlay_rects
+
+        else:
+            self.dirty_rects = None
+
+        self.overlay_rects = overlay_rects
+
+    def get_overlay_rects(self) -> list:
+        '''Returns the screen areas covered by the cursor, menu and spells'''
+        spell = self.player.spells.sprite
+        tooltip_rect = spell.tooltip_text.background_surface.get_rect(
+            center=spell.tooltip_text.rect.center
+        )
+
+        return [
+            pygame.Rect(self.cursor.rect),
+            pygame.Rect(self.menu.menu_rect),
+            pygame.Rect(self.menu.exit_text[1]),
+            pygame.Rect(self.menu.pause_button.rect),
+            pygame.Rect(spell.rect),
+            tooltip_rect.union(spell.tooltip_text.rect)
+        ]
+
     def update(self):
         '''Updates all sprites and ui'''
         if self.state['unpaused'] and not self.level.transitioning:
@@ -136,6 +314,10 @@ class App:
         self.cursor_group.update()
         self.level.update()
 
+        # events are only handled by the first tick after they arrive
+        self.events = []
+        self.ticks += 1
+
 
 if __name__ == "__main__":
     App().run()
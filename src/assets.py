@@ -0,0 +1,137 @@
+from atlas import Atlas
+from surface_cache import SurfaceCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pygame
+import os
+import time
+
+
+class AssetRegistry:
+    def __init__(self, budget: int):
+        '''Decodes image files by name on first use once they are indexed'''
+        # file paths of each image by filename without its extension
+        self.paths = {}
+
+        # frame names of each sprite folder in animation order
+        self.folders = {}
+
+        # decoded images evicted least recently used first once over the budget
+        self.images = SurfaceCache(budget)
+
+        # images are cut from a prebuilt atlas instead when it is up to date
+        self.atlas = None
+
+        # changes whenever an image file is added, removed or modified
+        self.signature = None
+
+    def index(self, path: str, atlas_path=None):
+        '''Finds the image files within the path'''
+        self.clear()
+        self.paths.clear()
+        self.folders.clear()
+
+        for (path, dirs, files) in os.walk(path, topdown=True):
+            frames = []
+            for file in files:
+                file_name, extension = file.split('.')
+                if extension == 'png':
+                    self.paths[file_name] = os.path.join(path, file)
+                    frames.append(file_name)
+
+            # sorts filenames by length and then alphabetically
+            frames.sort(key=lambda filename: (len(filename), filename))
+            self.folders[os.path.normpath(path)] = tuple(frames)
+
+        self.signature = Atlas.get_signature(self.paths)
+
+        self.atlas = None
+        if atlas_path:
+            self.atlas = Atlas.load(atlas_path, self.signature)
+
+    def has_folder(self, path: str) -> bool:
+        return os.path.normpath(path) in self.folders
+
+    def get_frame_names(self, path: str) -> tuple:
+        '''Returns the names of the images in the folder in animation order'''
+        return self.folders[os.path.normpath(path)]
+
+    def decode(self, name: str) -> pygame.Surface:
+        '''Reads and decodes the image file without converting it'''
+        return pygame.image.load(self.paths[name])
+
+    def load(self, name: str, image=None) -> pygame.Surface:
+        if image is None:
+            image = self.decode(name)
+
+        # converting uses the display so it is only done on the main thread
+        image = image.convert_alpha()
+
+        self.images.set(name, image, SurfaceCache.get_bytes(image))
+
+        # keeps the most recently used image even if it exceeds the budget
+        self.images.evict()
+
+        return image
+
+    def preload(self, names=None, progress=None, workers=None) -> dict:
+        '''Decodes images across worker threads until the byte budget is full
+           Calls progress with the images loaded and total after each image'''
+        start = time.perf_counter()
+        workers = workers or os.cpu_count() or 1
+
+        # atlas images are already mapped and need no decoding
+        names = [] if self.atlas else [
+            name for name in (names or self.paths)
+            if name not in self.images
+        ]
+
+        loaded = 0
+        size = self.images.bytes
+        with ThreadPoolExecutor(workers) as pool:
+            futures = {pool.submit(self.decode, name): name for name in names}
+
+            for future in as_completed(futures):
+                image = future.result()
+
+                # stops before preloaded images begin evicting each other
+                if (self.images.bytes + image.get_width() * image.get_height() * 4
+                        > self.images.budget):
+                    for pending in futures:
+                        pending.cancel()
+
+                    break
+
+                self.load(futures[future], image)
+                loaded += 1
+
+                progress and progress(loaded, len(names))
+
+        return {
+            'images': loaded,
+            'bytes': self.images.bytes - size,
+            'seconds': time.perf_counter() - start,
+            'workers': workers
+        }
+
+    def clear(self):
+        self.images.clear()
+
+    def __getitem__(self, name: str) -> pygame.Surface:
+        if self.atlas:
+            return self.atlas.get(name)
+
+        image = self.images.get(name)
+        if image is None:
+            image = self.load(name)
+
+        return image
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
@@ -0,0 +1,143 @@
+import pygame
+import hashlib
+import json
+import mmap
+import os
+
+
+class Atlas:
+    # bump when the page or index format changes to invalidate built atlases
+    version = 1
+    max_page_size = 2048
+
+    def __init__(self, path: str, index: dict):
+        '''Maps atlas pages into memory and cuts images out of them'''
+        self.rects = index['images']
+
+        # pages are mapped copy on write so they are never decoded or copied
+        self.buffers = []
+        self.pages = []
+        for page, size in enumerate(index['pages']):
+            with open(os.path.join(path, f'page{page}.raw'), 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+            self.buffers.append(buffer)
+            self.pages.append(pygame.image.frombuffer(buffer, size, 'BGRA'))
+
+        self.images = {}
+
+    @staticmethod
+    def get_signature(paths: dict) -> str:
+        '''Hashes the name, size and modified time of every image file'''
+        signature = hashlib.sha1()
+        for name in sorted(paths):
+            stat = os.stat(paths[name])
+            signature.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+
+        return signature.hexdigest()
+
+    @staticmethod
+    def load(path: str, signature: str):
+        '''Returns the atlas or None if it was built from other images'''
+        try:
+            with open(os.path.join(path, 'index.json'), 'r') as file:
+                index = json.load(file)
+
+            if (index['version'] != Atlas.version
+                    or index['signature'] != signature):
+                return None
+
+            return Atlas(path, index)
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def pack(sizes: dict, max_page_size: int):
+        '''Packs rects into pages by filling rows from tallest to shortest'''
+        rects = {}
+        pages = []
+
+        page = 0
+        x = y = shelf_height = page_width = 0
+        for name in sorted(sizes, key=lambda name: sizes[name][::-1], reverse=True):
+            width, height = sizes[name]
+
+            # starts a new shelf when the row is full
+            if x + width > max_page_size:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+
+            # starts a new page when the shelves are full
+            if y + height > max_page_size:
+                pages.append((page_width, y + shelf_height))
+                page += 1
+                x = y = shelf_height = page_width = 0
+
+            rects[name] = (page, x, y, width, height)
+
+            x += width
+            shelf_height = max(shelf_height, height)
+            page_width = max(page_width, x)
+
+        if rects:
+            pages.append((page_width, y + shelf_height))
+
+        return rects, pages
+
+    @staticmethod
+    def build(path: str, paths: dict, max_page_size=max_page_size):
+        '''Packs every image into raw pixel pages and writes their index'''
+        images = {name: pygame.image.load(paths[name]) for name in paths}
+        rects, pages = Atlas.pack(
+            {name: image.get_size() for name, image in images.items()},
+            max_page_size
+        )
+
+        surfaces = [pygame.Surface(size, pygame.SRCALPHA, 32) for size in pages]
+        for name, (page, x, y, width, height) in rects.items():
+            surfaces[page].blit(images[name], (x, y))
+
+        # pixels are stored with straight alpha in the byte order of the display
+        os.makedirs(path, exist_ok=True)
+        for page, surface in enumerate(surfaces):
+            with open(os.path.join(path, f'page{page}.raw'), 'wb') as file:
+                file.write(pygame.image.tobytes(surface, 'BGRA'))
+
+        with open(os.path.join(path, 'index.json'), 'w') as file:
+            json.dump({
+                'version': Atlas.version,
+                'signature': Atlas.get_signature(paths),
+                'pages': pages,
+                'images': {
+                    name: (page, (x, y, width, height))
+                    for name, (page, x, y, width, height) in rects.items()
+                }
+            }, file, separators=(',', ':'))
+
+        return rects, pages
+
+    def get(self, name: str) -> pygame.Surface:
+        if name not in self.images:
+            page, rect = self.rects[name]
+            self.images[name] = self.pages[page].subsurface(rect)
+
+        return self.images[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.rects
+
+
+if __name__ == '__main__':
+    from constants import *
+    import time
+
+    start = time.perf_counter()
+    IMAGES.index(SPRITE_PATH)
+    rects, pages = Atlas.build(ATLAS_PATH, IMAGES.paths)
+
+    print(
+        f'packed {len(rects)} images into {len(pages)} pages '
+        f'in {(time.perf_counter() - start) * 1000:.0f} ms'
+    )
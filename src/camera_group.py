@@ -1,4 +1,8 @@
 from constants import *
+from spatial_grid import SpatialGrid
+from depth_order import DepthOrder
+from render_queue import RenderQueue
+from shadow import Shadow
 
 import pygame
 
@@ -9,14 +13,46 @@ class CameraGroup(pygame.sprite.Group):
         self.screen = pygame.display.get_surface()
         self.game = game
 
+        # the world is drawn onto a render target at a fraction of the screen resolution
+        self.render_scale = 1
+        self.render_target = self.screen
+
+        # batches blits to the render target
+        self.render_queue = RenderQueue(self.render_target)
+
         # camera offset
         self.offset = pygame.math.Vector2()
 
+        # fraction of a tick elapsed since the last update
+        self.interpolation = 1
+
+        # spatial index for culling sprites outside the screen
+        self.spatial_grid = SpatialGrid(GRID_CELL_SIZE)
+
+        # render order maintained across frames
+        self.depth_order = DepthOrder()
+
         # dimensions
         self.half_width = round(self.game.width // 2)
         self.half_height = round(self.game.height // 2)
 
-        # lighting
+        # lighting is accumulated at a fraction of the screen resolution
+        self.light_map_scale = 4
+        self.light_map = pygame.Surface((
+            math.ceil(self.game.width / self.light_map_scale),
+            math.ceil(self.game.height / self.light_map_scale)
+        ))
+
+        self.shade_map = pygame.Surface(self.light_map.get_size())
+        self.light_surface = pygame.Surface(self.render_target.get_size())
+
+        # filled with the shade of unlit areas since blits blend faster than fills
+        self.shade_surface = pygame.Surface(self.render_target.get_size())
+        self.shade = None
+
+        # glows are a quarter as bright as the light they are cast from
+        self.glow_intensity = (64,) * 3
+
         self.light_colors = (Color.GOLD, Color.SKY_BLUE1, Color.BLACK)
         self.light_sizes = [i for i in range(0, 200, 10)]
         self.lights = {}
@@ -26,41 +62,124 @@ class CameraGroup(pygame.sprite.Group):
 
             for light_radius in self.light_sizes:
                 image = IMAGES['soft_light'].copy()
-                image = color_image(image, light_color, transparency=64)
-                image = pygame.transform.scale(
+                image = color_image(image, light_color)
+                image = pygame.transform.smoothscale(
                     image,
-                    (light_radius * 2,) * 2
+                    (round(light_radius * 2 / self.light_map_scale),) * 2
                 )
 
-                self.lights[light_color][light_radius] = image
+                # premultiplies color by transparency for additive blending
+                light = pygame.Surface(image.get_size())
+                light.blit(image, (0, 0))
+
+                self.lights[light_color][light_radius] = light
+
+        # glows at the render target resolution keyed by color and radius
+        self.glows = {}
 
         # screen shake
         self.screen_shake_offset = 0
 
+    def set_render_scale(self, scale: float):
+        '''Resizes the render target the world is drawn onto'''
+        self.render_scale = scale
+        self.render_target = self.screen
+        if scale != 1:
+            self.render_target = pygame.Surface((
+                round(self.game.width * scale),
+                round(self.game.height * scale)
+            )).convert()
+
+        self.render_queue.set_surface(self.render_target, scale)
+        self.light_surface = pygame.Surface(self.render_target.get_size())
+        self.shade_surface = pygame.Surface(self.render_target.get_size())
+        self.shade = None
+        self.glows.clear()
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.depth_order.move(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.spatial_grid.remove(sprite)
+        self.depth_order.remove(sprite)
+
+    def relocate(self, sprite):
+        '''Updates the position of the sprite within the spatial index and depth order'''
+        if self.has_internal(sprite):
+            self.spatial_grid.insert(sprite, self.get_bounds(sprite))
+            self.depth_order.move(sprite)
+
+    def get_bounds(self, sprite) -> pygame.Rect:
+        '''Returns the rect covering the sprite, its shadow and its light
+           Shadows are covered at their largest so every frame of the animation fits'''
+        bounds = sprite.rect
+        if sprite.draw_shadow and sprite.shadow:
+            shadow_rect = pygame.Rect((0, 0), Shadow.get_extent(sprite.rect.size))
+            shadow_rect.bottomleft = sprite.hitbox.bottomleft
+
+            bounds = bounds.union(shadow_rect)
+
+        if sprite.draw_light:
+            light_rect = pygame.Rect(
+                0,
+                0,
+                sprite.light_radius * 2,
+                sprite.light_radius * 2
+            )
+
+            light_rect.center = sprite.hitbox.center
+            bounds = bounds.union(light_rect)
+
+        return bounds
+
+    def get_visible_sprites(self) -> set:
+        '''Returns the sprites overlapping the screen'''
+        view = pygame.Rect(self.offset, self.game.resolution)
+
+        # sprites are relocated whenever their bounds change
+        nearby_sprites = self.spatial_grid.query(view)
+
+        return {
+            sprite for sprite in nearby_sprites
+            if view.colliderect(self.get_bounds(sprite))
+        }
+
+    def get_interpolation(self, sprite) -> pygame.math.Vector2:
+        '''Returns how far behind its coords the sprite is drawn between ticks'''
+        # only sprites that moved during the last tick are interpolated
+        if sprite.moved_tick != self.game.ticks - 1:
+            return pygame.math.Vector2()
+
+        return (sprite.coords - sprite.previous_coords) \
+            * (self.interpolation - 1)
+
     def center_target(self, target):
         self.offset.xy = -HALF_TILE_SIZE, -HALF_TILE_SIZE
+        coords = target.coords + self.get_interpolation(target)
 
         # stops scrolling screen when the player is past right edge of the screen
-        if (target.coords.x >= self.game.level.size.x - self.half_width):
+        if (coords.x >= self.game.level.size.x - self.half_width):
             self.offset.x = self.game.level.size.x \
                 - self.game.width \
                 - HALF_TILE_SIZE
 
         # starts scrolling screen when the player is in the middle of the screen
-        elif (target.coords.x > self.half_width):
-            self.offset.x = target.coords.x \
+        elif (coords.x > self.half_width):
+            self.offset.x = coords.x \
                 - self.half_width \
                 - HALF_TILE_SIZE
 
         # stops scrolling screen when the player is past bottom edge of the screen
-        if (target.coords.y >= self.game.level.size.y - self.half_height - HALF_TILE_SIZE):
+        if (coords.y >= self.game.level.size.y - self.half_height - HALF_TILE_SIZE):
             self.offset.y = self.game.level.size.y \
                 - self.game.height \
                 - HALF_TILE_SIZE
 
         # starts scrolling screen when the player is in the middle of the screen
-        elif (target.coords.y > self.half_height - HALF_TILE_SIZE):
-            self.offset.y = target.coords.y - self.half_height
+        elif (coords.y > self.half_height - HALF_TILE_SIZE):
+            self.offset.y = coords.y - self.half_height
 
         self.offset.y += self.screen_shake_offset
 
@@ -79,112 +198,230 @@ class CameraGroup(pygame.sprite.Group):
 
         return False
 
-    def render(self, show_hitboxes=False, show_collision_boxes=False, show_rects=False):
+    def render(self, interpolation=1, show_hitboxes=False, show_collision_boxes=False, show_rects=False):
         '''Draws the screen according to player movement'''
+        self.interpolation = interpolation
         self.center_target(self.game.player)
-        self.screen.blit(
-            self.game.level.grass_layer,
-            (-HALF_TILE_SIZE,) * 2 - self.offset.xy
-        )
 
-        self.screen.blit(
-            self.game.level.terrain_layer,
-            (-HALF_TILE_SIZE,) * 2 - self.offset.xy
-        )
+        # the screen is filled by the game but a smaller target keeps the last frame
+        if self.render_target is not self.screen:
+            self.render_target.fill(Color.GRASS_GREEN)
 
-        self.screen.blit(
-            self.game.level.terrain_overlay_layer,
-            (-HALF_TILE_SIZE,) * 2 - self.offset.xy
-        )
+        self.draw_ground()
 
-        # sorts sprites by sprite layer as primary and rectangle bottom as secondary
-        for sprite in sorted(
-            self.sprites(),
-            key=lambda sprite: (
-                sprite.sprite_layer,
-                sprite.hitbox.bottom
-            )
-        ):
+        # sorts visible sprites by sprite layer as primary and rectangle bottom as secondary
+        visible_sprites = self.get_visible_sprites()
+        for sprite in self.depth_order.sort(visible_sprites):
+            # draws sprites between their last two positions
+            offset = self.offset - self.get_interpolation(sprite)
 
-            # optimizes sprite draws
-            if self.check_bounds(sprite):
-                # draws shadows
-                if sprite.draw_shadow and sprite.shadow:
-                    self.draw_shadow(sprite)
+            # draws shadows
+            if sprite.draw_shadow and sprite.shadow:
+                self.draw_shadow(sprite, offset)
 
-                # draws sprite
-                offset_pos = sprite.rect.topleft - self.offset
-                self.screen.blit(sprite.image, offset_pos)
+            # draws sprite
+            offset_pos = sprite.rect.topleft - offset
+            self.render_queue.blit(sprite.image, offset_pos)
 
-                # draws lighting
-                sprite.draw_light and self.draw_lighting(sprite)
+            # debug boxes are drawn over everything queued before them
+            if show_hitboxes or show_collision_boxes or show_rects:
+                self.render_queue.flush()
 
-                # draws sprite hitboxes
-                show_hitboxes and self.draw_hitboxes(sprite)
+            # draws sprite hitboxes
+            show_hitboxes and self.draw_hitboxes(sprite)
 
-                # draws sprite collision boxes
-                show_collision_boxes and self.draw_collision_boxes(sprite)
+            # draws sprite collision boxes
+            show_collision_boxes and self.draw_collision_boxes(sprite)
 
-                # draws sprite rects
-                show_rects and self.draw_rects(sprite)
+            # draws sprite rects
+            show_rects and self.draw_rects(sprite)
 
-    def draw_shadow(self, sprite):
-        shadow_pos = sprite.hitbox.bottomleft - self.offset
+        self.render_queue.flush()
+        self.draw_lighting(visible_sprites)
+
+        # upscales the world onto the screen
+        if self.render_target is not self.screen:
+            pygame.transform.scale(
+                self.render_target,
+                self.game.resolution,
+                self.screen
+            )
+
+    def draw_ground(self):
+        '''Draws the ground chunks within the screen'''
+        view = pygame.Rect(self.offset, self.game.resolution)
+        for chunk, coords in self.game.level.ground.visible_chunks(view):
+            self.render_queue.blit(chunk, coords - self.offset)
+
+    def draw_shadow(self, sprite, offset: pygame.math.Vector2):
+        shadow_pos = sprite.hitbox.bottomleft - offset
         shadow_pos.y -= sprite.shadow.surface.get_height()
-        self.screen.blit(sprite.shadow.surface, shadow_pos)
+        self.render_queue.blit(sprite.shadow.surface, shadow_pos)
+
+    def get_glow(self, light_color: tuple, light_radius: int) -> pygame.Surface:
+        '''Returns the tint cast around a light at the render target resolution'''
+        key = light_color, light_radius
+        if key not in self.glows:
+            image = color_image(IMAGES['soft_light'].copy(), light_color)
+            image = pygame.transform.smoothscale(
+                image,
+                (round(light_radius * 2 * self.render_scale),) * 2
+            )
+
+            # premultiplies color by transparency for additive blending
+            glow = pygame.Surface(image.get_size())
+            glow.blit(image, (0, 0))
+            glow.fill(self.glow_intensity, special_flags=pygame.BLEND_RGB_MULT)
+
+            self.glows[key] = glow.convert()
+
+        return self.glows[key]
+
+    def draw_lighting(self, sprites: set):
+        '''Darkens the screen except around lights and tints the screen around lights'''
+        darkness = self.game.level.ambient_darkness
+
+        # visible sprites already include lights reaching into the screen
+        lit_sprites = [sprite for sprite in sprites if sprite.draw_light]
+        if not lit_sprites and not darkness:
+            return
+
+        # top left of each light relative to the screen
+        lights = [
+            (
+                sprite,
+                sprite.hitbox.center
+                + self.get_interpolation(sprite)
+                - self.offset
+                - (sprite.light_radius,) * 2
+            )
+            for sprite in lit_sprites
+        ]
+
+        if darkness:
+            self.draw_shade(darkness, lights)
+
+        # glows are added directly so lights alone never touch the whole screen
+        self.render_target.blits([
+            (
+                self.get_glow(sprite.light_color, sprite.light_radius),
+                coords * self.render_scale,
+                None,
+                pygame.BLEND_RGB_ADD
+            )
+            for sprite, coords in lights
+        ], doreturn=False)
+
+    def draw_shade(self, darkness: int, lights: list):
+        '''Darkens the screen and accumulates lights into the light map where lit'''
+        shade = (255 - darkness,) * 3
+        screen_rect = self.render_target.get_rect()
+
+        # only the area around lights is upscaled from the light map
+        lit_rect = pygame.Rect(0, 0, 0, 0)
+        if lights:
+            self.light_map.fill(Color.MIDNIGHT)
+            self.light_map.blits([
+                (
+                    self.lights[sprite.light_color][sprite.light_radius],
+                    coords / self.light_map_scale,
+                    None,
+                    pygame.BLEND_RGB_ADD
+                )
+                for sprite, coords in lights
+            ], doreturn=False)
+
+            # light map pixels within the lights and the pixel around them
+            map_rect = pygame.Rect(lights[0][1] / self.light_map_scale, (0, 0))
+            map_rect.unionall_ip([
+                pygame.Rect(
+                    coords / self.light_map_scale,
+                    self.lights[sprite.light_color][sprite.light_radius].get_size()
+                )
+                for sprite, coords in lights
+            ])
+
+            map_rect = map_rect.inflate(2, 2).clip(self.light_map.get_rect())
+
+            # the same pixels on the render target
+            scale = screen_rect.width / self.light_map.get_width()
+            lit_rect = pygame.Rect(
+                round(map_rect.x * scale),
+                round(map_rect.y * scale),
+                round(map_rect.width * scale),
+                round(map_rect.height * scale)
+            ).clip(screen_rect)
+
+        if shade != self.shade:
+            self.shade = shade
+            self.shade_surface.fill(shade)
+
+        # unlit areas are darkened evenly without the light map
+        for rect in (
+            (0, 0, screen_rect.width, lit_rect.top),
+            (0, lit_rect.bottom, screen_rect.width, screen_rect.height - lit_rect.bottom),
+            (0, lit_rect.top, lit_rect.left, lit_rect.height),
+            (lit_rect.right, lit_rect.top, screen_rect.width - lit_rect.right, lit_rect.height)
+        ):
+            if rect[2] > 0 and rect[3] > 0:
+                self.render_target.blit(
+                    self.shade_surface,
+                    rect[:2],
+                    rect,
+                    special_flags=pygame.BLEND_RGB_MULT
+                )
 
-    def draw_lighting(self, sprite):
-        light = self.lights[sprite.light_color][sprite.light_radius]
-        light_pos = (
-            sprite.hitbox.centerx - sprite.light_radius,
-            sprite.hitbox.centery - sprite.light_radius
+        if not lit_rect:
+            return
+
+        shade_map = self.shade_map.subsurface(map_rect)
+        shade_map.fill(shade)
+        shade_map.blit(
+            self.light_map,
+            (0, 0),
+            map_rect,
+            special_flags=pygame.BLEND_RGB_ADD
         )
 
-        light_pos -= self.offset
-        self.screen.blit(light, light_pos)
+        light_surface = self.light_surface.subsurface((0, 0), lit_rect.size)
+        pygame.transform.smoothscale(shade_map, lit_rect.size, light_surface)
 
-    def draw_hitboxes(self, sprite):
-        hitbox = pygame.Rect(
-            sprite.hitbox.x - self.offset.x,
-            sprite.hitbox.y - self.offset.y,
-            sprite.hitbox.width,
-            sprite.hitbox.height
+        self.render_target.blit(
+            light_surface,
+            lit_rect,
+            special_flags=pygame.BLEND_RGB_MULT
         )
 
+    def get_target_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        '''Returns the rect offset by the camera and scaled to the render target'''
+        return pygame.Rect(
+            (rect.x - self.offset.x) * self.render_scale,
+            (rect.y - self.offset.y) * self.render_scale,
+            rect.width * self.render_scale,
+            rect.height * self.render_scale
+        )
+
+    def draw_hitboxes(self, sprite):
         pygame.draw.rect(
-            self.screen,
+            self.render_target,
             Color.RED,
-            hitbox,
+            self.get_target_rect(sprite.hitbox),
             1
         )
 
     def draw_collision_boxes(self, sprite):
-        collision_box = pygame.Rect(
-            sprite.collision_box.x - self.offset.x,
-            sprite.collision_box.y - self.offset.y,
-            sprite.collision_box.width,
-            sprite.collision_box.height
-        )
-
         pygame.draw.rect(
-            self.screen,
+            self.render_target,
             Color.ASH,
-            collision_box,
+            self.get_target_rect(sprite.collision_box),
             1
         )
 
     def draw_rects(self, sprite):
-        rect = pygame.Rect(
-            sprite.rect.x - self.offset.x,
-            sprite.rect.y - self.offset.y,
-            sprite.rect.width,
-            sprite.rect.height
-        )
-
         pygame.draw.rect(
-            self.screen,
+            self.render_target,
             Color.WHITE,
-            rect,
+            self.get_target_rect(sprite.rect),
             1
         )
 
@@ -1,4 +1,7 @@
 class Color:
+    # transparent pixels of surfaces blitted through a colorkey
+    COLORKEY = (255, 0, 255)
+
     # reds
     RED = (211, 47, 47)
     BLOOD_RED = (198, 40, 40)
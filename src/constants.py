@@ -1,47 +1,123 @@
 from color import Color
+from assets import AssetRegistry
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame 
 import math
 import os
 import random
 
-pygame.init()
-pygame.display.set_mode()
+# renders offscreen through the sdl dummy video driver when set
+HEADLESS = os.environ.get('NOVORUS_HEADLESS', '0') != '0'
+HEADLESS_RESOLUTION = tuple(
+    int(length) for length in
+    os.environ.get('NOVORUS_RESOLUTION', '1280x720').split('x')
+)
 
 # tile pixel size
 TILE_SIZE = 100
 HALF_TILE_SIZE = TILE_SIZE / 2
 STARTING_FLOOR = 1
 
+# simulation ticks per second and milliseconds per tick
+TICK_RATE = 60
+TICK_DURATION = 1000 / TICK_RATE
+
+# ground chunk pixel size
+CHUNK_SIZE = TILE_SIZE * 8
+
+# spatial grid cell pixel size
+GRID_CELL_SIZE = TILE_SIZE * 2
+
+# pixels the hitbox bottoms of static sprites baked together may differ by
+# as sprites in between sort against the lowest bottom of the batch
+STATIC_BAND_HEIGHT = 2
+
+# pixel step sprite sizes are rounded to so similar sizes share frames
+FRAME_SIZE_STEP = 4
+
+# rendered strings kept and characters composed from glyphs instead of the font
+TEXT_CACHE_SIZE = 256
+TEXT_GLYPHS = '0123456789+-.,/%'
+
 # file paths
 LEVEL_PATH = '../levels'
 SPRITE_PATH = '../sprites'
 ITEM_PATH = '../items'
+CACHE_PATH = '../cache'
+ATLAS_PATH = f'{CACHE_PATH}/atlas'
+LEVEL_CACHE_PATH = f'{CACHE_PATH}/levels'
+
+# stores generated assets on disk so warm starts skip generating them
+DISK_CACHE = os.environ.get('NOVORUS_DISK_CACHE', '1') != '0'
+
+# prints the time spent in each phase of startup and decoding images
+STARTUP_REPORT = os.environ.get('NOVORUS_STARTUP_REPORT', '0') != '0'
+
+# counts drawn surfaces that are converted to the display format on every blit
+FORMAT_REPORT = os.environ.get('NOVORUS_FORMAT_REPORT', '0') != '0'
+
+# bytes of decoded images kept before the least recently used are evicted
+ASSET_BUDGET = 4 * 2 ** 20
 
-# retrieving image files for tooltips
-IMAGES = {}
-for (path, dirs, files) in os.walk(SPRITE_PATH, topdown=True):
-    for file in files:
-        file_name, extension = file.split('.')
-        if extension == 'png':
-            IMAGES[file_name] = pygame.image.load(
-                os.path.join(path, file)
-            ).convert_alpha()
-
-# retrieving text files for tooltips
+# seeds the placement of grass so floors look the same on every visit
+LEVEL_SEED = int(os.environ.get('NOVORUS_SEED', '0'))
+
+# bytes of scaled frames and shadows kept before the least recently used are evicted
+FRAME_BUDGET = 64 * 2 ** 20
+
+# bytes of ground chunks kept before the least recently used are evicted
+GROUND_BUDGET = 48 * 2 ** 20
+
+# bytes each disk cache keeps before the least recently used entries are pruned
+DISK_CACHE_BUDGET = 256 * 2 ** 20
+
+# assets are loaded into these by init so importing has no side effects
+# decodes image files on first use
+IMAGES = AssetRegistry(ASSET_BUDGET)
 ITEM_TOOLTIPS = {}
-for (path, dirs, files) in os.walk(ITEM_PATH, topdown=True):
-    for file in files:
-        with open(os.path.join(path, file), 'r') as item:
-            tooltip = [line.strip() for line in item.readlines()]
+COMICORO = {}
+
+
+def read_tooltip(path: str) -> list:
+    with open(path, 'r') as item:
+        return [line.strip() for line in item.readlines()]
+
+
+def init(timeline=None):
+    '''Initializes pygame and loads the assets shared by every module'''
+    if HEADLESS:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    pygame.init()
+    timeline and timeline.mark('pygame init')
+
+    # "Creative Commons Comicoro" by jeti is licensed under CC BY 4.0
+    # creating multiple font sizes
+    COMICORO.update({
+        size: pygame.font.Font('../comicoro.ttf', size)
+        for size in (20, 25, 35, 50)
+    })
+
+    timeline and timeline.mark('fonts')
+
+    # indexes image files
+    # images are mapped from the atlas built by atlas.py when it is up to date
+    IMAGES.index(SPRITE_PATH, ATLAS_PATH)
+    timeline and timeline.mark('images')
+
+    # retrieving text files for tooltips
+    with ThreadPoolExecutor() as pool:
+        for tooltip in pool.map(read_tooltip, [
+            os.path.join(path, file)
+            for (path, dirs, files) in os.walk(ITEM_PATH, topdown=True)
+            for file in files
+        ]):
             ITEM_TOOLTIPS[tooltip[0].replace(" ", "_").lower()] = tooltip
 
-# "Creative Commons Comicoro" by jeti is licensed under CC BY 4.0
-# creating multiple font sizes
-COMICORO = {
-    size: pygame.font.Font('../comicoro.ttf', size)
-    for size in (20, 25, 35, 50)
-}
+    timeline and timeline.mark('tooltips')
+
 
 def signum(value: float):
     '''Returns the sign of the value'''
@@ -50,9 +126,9 @@ def signum(value: float):
 
     return math.copysign(1, value)
 
-def randomize(value: int, offset: float):
+def randomize(value: int, offset: float, rng=random):
     '''Randomizes the value with a +- deviation of the offset'''
-    return random.randint(
+    return rng.randint(
         round(value * (1 - offset)),
         round(value * (1 + offset))
     )
@@ -74,6 +150,63 @@ def color_image(image: pygame.Surface, color: list, transparency=255):
     return image
 
 
+def is_display_format(surface: pygame.Surface) -> bool:
+    '''Returns whether the surface blits without being converted'''
+    display = pygame.display.get_surface()
+    return (surface.get_bitsize() == display.get_bitsize()
+            and surface.get_masks()[:3] == display.get_masks()[:3])
+
+
+def get_alpha_type(surface: pygame.Surface) -> str:
+    '''Returns whether the pixels are all opaque, either opaque or transparent or translucent'''
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return 'opaque'
+
+    # counts pixels that are at all visible and those that are fully opaque
+    visible = pygame.mask.from_surface(surface, 0).count()
+    opaque = pygame.mask.from_surface(surface, 254).count()
+
+    if opaque == surface.get_width() * surface.get_height():
+        return 'opaque'
+
+    # art that contains the colorkey keeps its alpha channel instead
+    keyed = pygame.mask.from_threshold(
+        surface,
+        Color.COLORKEY + (255,),
+        (1, 1, 1, 255)
+    ).count()
+
+    if opaque == visible and not keyed:
+        return 'binary'
+
+    return 'translucent'
+
+
+def optimize_surface(surface: pygame.Surface, alpha_type=None) -> pygame.Surface:
+    '''Converts the surface to the display format
+       Surfaces without translucent pixels are blitted through a run-length encoded colorkey'''
+    if not surface.get_flags() & pygame.SRCALPHA:
+        surface = surface.convert()
+        if surface.get_colorkey():
+            surface.set_colorkey(surface.get_colorkey(), pygame.RLEACCEL)
+
+        return surface
+
+    match alpha_type or get_alpha_type(surface):
+        case 'opaque':
+            return surface.convert()
+
+        case 'binary':
+            optimized = pygame.Surface(surface.get_size()).convert()
+            optimized.fill(Color.COLORKEY)
+            optimized.blit(surface, (0, 0))
+            optimized.set_colorkey(Color.COLORKEY, pygame.RLEACCEL)
+
+            return optimized
+
+    return surface.convert_alpha()
+
+
 def get_circle_surface(radius: float, color: list):
     '''Returns a circle surface'''
     circle_surface = pygame.Surface((radius * 2,) * 2, pygame.SRCALPHA)
@@ -86,7 +219,7 @@ def get_circle_surface(radius: float, color: list):
         radius
     )
 
-    return circle_surface
+    return optimize_surface(circle_surface)
 
 def rotate_center(image, angle, rect):
     '''Rotates image about its center'''
@@ -0,0 +1,76 @@
+from bisect import bisect_left
+from itertools import chain, count
+
+
+class DepthOrder:
+    def __init__(self):
+        '''Keeps sprites sorted by sprite layer and hitbox bottom across frames'''
+        # depths and sprites of each layer sorted by hitbox bottom
+        # sprites at the same depth are drawn in the order they were added
+        self.layers = {}
+
+        # the layer and (hitbox bottom, order added) each sprite is sorted by
+        self.depths = {}
+        self.added = {}
+        self.order = count()
+
+        # sprites that were added or moved since the last update
+        self.moved = set()
+
+    def move(self, sprite):
+        '''Marks the sprite to be sorted again'''
+        if sprite not in self.added:
+            self.added[sprite] = next(self.order)
+
+        self.moved.add(sprite)
+
+    def remove(self, sprite):
+        self.moved.discard(sprite)
+        self.added.pop(sprite, None)
+        self.unsort(sprite)
+
+    def unsort(self, sprite):
+        '''Takes the sprite out of the sorted sprites of its layer'''
+        depth = self.depths.pop(sprite, None)
+        if depth is None:
+            return
+
+        layer, key = depth
+        keys, sprites = self.layers[layer]
+
+        index = bisect_left(keys, key)
+        del keys[index]
+        del sprites[index]
+
+    def update(self):
+        '''Sorts again only the sprites that have moved'''
+        for sprite in self.moved:
+            depth = (
+                sprite.sprite_layer,
+                (sprite.hitbox.bottom, self.added[sprite])
+            )
+
+            if self.depths.get(sprite) == depth:
+                continue
+
+            self.unsort(sprite)
+            self.depths[sprite] = depth
+
+            layer, key = depth
+            if layer not in self.layers:
+                self.layers[layer] = ([], [])
+
+            keys, sprites = self.layers[layer]
+            index = bisect_left(keys, key)
+            keys.insert(index, key)
+            sprites.insert(index, sprite)
+
+        self.moved.clear()
+
+    def sort(self, sprites: set) -> list:
+        '''Returns the sprites sorted by sprite layer and then hitbox bottom'''
+        self.update()
+        return list(chain.from_iterable(
+            filter(sprites.__contains__, self.layers[layer][1])
+            for layer in sorted(self.layers)
+        ))
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import threading
+
+
+class DiskCache:
+    def __init__(self, path: str, enabled=True, budget=None):
+        '''Stores raw bytes in files named by the hash of their key
+           Entries are pruned least recently used first once over the budget'''
+        self.path = path
+        self.enabled = enabled
+        self.budget = budget
+
+    def get_key(self, *parts) -> str:
+        '''Hashes bytes and the string form of everything else'''
+        key = hashlib.sha1()
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = str(part).encode()
+
+            key.update(part)
+            key.update(b'\0')
+
+        return key.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.raw')
+
+    def get(self, key: str):
+        '''Returns the bytes stored under the key or None if missing'''
+        if not self.enabled:
+            return None
+
+        path = self.get_path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+            # stale entries can only be told apart by when they were last used
+            os.utime(path)
+            return data
+
+        except OSError:
+            return None
+
+    @staticmethod
+    def write(path: str, data: bytes):
+        '''Writes to a temporary file first so readers never see partial files'''
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+
+            os.replace(temp_path, path)
+
+        except OSError:
+            # the cache is an optimization so failed writes are ignored
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def set(self, key: str, data: bytes):
+        if self.enabled:
+            self.write(self.get_path(key), data)
+
+    def prune(self):
+        '''Deletes the least recently used entries until within the budget'''
+        if not self.enabled or self.budget is None:
+            return
+
+        try:
+            entries = [
+                entry for entry in os.scandir(self.path)
+                if entry.name.endswith('.raw')
+            ]
+
+        except OSError:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.budget:
+                break
+
+            try:
+                os.remove(entry.path)
+                size -= entry.stat().st_size
+
+            except OSError:
+                pass
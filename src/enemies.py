@@ -7,12 +7,16 @@ import pygame
 
 
 class Ghost(MeleeEntity):
+    # smoke is drawn as circles and needs no frames
+    animation_path = 'enemies/ghost'
+    hitbox_scale = (0.25, 0.25)
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = 'Ghost'
 
         # hitbox
-        self.set_hitbox(0.25, 0.25)
+        self.set_hitbox(*self.hitbox_scale)
         self.set_collision_box(0.25, 0.25)
 
         # stats
@@ -31,7 +35,7 @@ class Ghost(MeleeEntity):
             'attack': 200
         }
 
-        self.set_animation('enemies/ghost', isFolder=True)
+        self.set_animation(self.animation_path, isFolder=True)
 
         # attack cooldown
         self.attack_cooldown = self.animation_cooldowns['attack']
@@ -39,18 +43,18 @@ class Ghost(MeleeEntity):
             - 3
 
         # smoke
-        self.smoke_time = pygame.time.get_ticks()
+        self.smoke_time = self.game.get_ticks()
         self.smoke_cooldown = 50
 
     def animation(self):
         super().animation()
 
         # does not draw smoke unless time elapsed exceeds cooldown
-        if not pygame.time.get_ticks() - self.smoke_time > self.smoke_cooldown:
+        if not self.game.get_ticks() - self.smoke_time > self.smoke_cooldown:
             return
     
         # draws smoke trail and randomizes position
-        self.smoke_time = pygame.time.get_ticks()
+        self.smoke_time = self.game.get_ticks()
         smoke_pos = list(self.hitbox.midbottom)
         smoke_pos[0] += random.randint(
             -self.hitbox.width // 4,
@@ -84,12 +88,15 @@ class Ghost(MeleeEntity):
 
 
 class Mimic(MeleeEntity):
+    animation_path = 'enemies/mimic'
+    hitbox_scale = (0.55, 0.45)
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = 'Mimic'
 
         # hitbox
-        self.set_hitbox(0.55, 0.45)
+        self.set_hitbox(*self.hitbox_scale)
         self.set_collision_box(0.55, 0.45)
 
         # stats
@@ -104,7 +111,7 @@ class Mimic(MeleeEntity):
             'attack': 1200
         }
 
-        self.set_animation('enemies/mimic', isFolder=True)
+        self.set_animation(self.animation_path, isFolder=True)
 
         # attack cooldown
         self.attack_cooldown = 200
@@ -113,12 +120,16 @@ class Mimic(MeleeEntity):
 
 
 class Sunflower(RangerEntity):
+    animation_path = 'enemies/sunflower'
+    hitbox_scale = (0.25, 0.3)
+    spawned_animations = ('projectiles/sun_charge',)
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = 'Sunflower'
 
         # hitbox
-        self.set_hitbox(0.25, 0.3)
+        self.set_hitbox(*self.hitbox_scale)
         self.set_collision_box(0.25, 0.3)
 
         # stats
@@ -133,7 +144,7 @@ class Sunflower(RangerEntity):
             'attack': 0
         }
 
-        self.set_animation('enemies/sunflower', isFolder=True)
+        self.set_animation(self.animation_path, isFolder=True)
 
         # attack cooldown
         self.attack_cooldown = 5000
@@ -143,8 +154,12 @@ class Sunflower(RangerEntity):
         # does not turn towards target
         pass
 
+    @staticmethod
+    def get_projectile_size(hitbox: pygame.Rect) -> tuple:
+        return (hitbox.height * 2,) * 2
+
     def create_projectile(self, target):
-        projectile_size = (self.hitbox.height * 2,) * 2
+        projectile_size = self.get_projectile_size(self.hitbox)
         projectile_pos = list(self.hitbox.midtop)
         projectile_pos[1] -= self.hitbox.height / 2
 
@@ -164,12 +179,16 @@ class Sunflower(RangerEntity):
 
 
 class Acorn(RangerEntity):
+    animation_path = 'enemies/acorn'
+    hitbox_scale = (0.5, 0.5)
+    spawned_animations = ('projectiles/thorn',)
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = 'Angry Acorn'
 
         # hitbox
-        self.set_hitbox(0.5, 0.5)
+        self.set_hitbox(*self.hitbox_scale)
         self.set_collision_box(0.5, 0.5)
 
         # stats
@@ -187,14 +206,18 @@ class Acorn(RangerEntity):
             'attack': 100
         }
 
-        self.set_animation('enemies/acorn', isFolder=True)
+        self.set_animation(self.animation_path, isFolder=True)
 
         # attack cooldown
         self.attack_cooldown = 1500
         self.impact_frame = 6
 
+    @staticmethod
+    def get_projectile_size(hitbox: pygame.Rect) -> tuple:
+        return (hitbox.width * 1.5,) * 2
+
     def create_projectile(self, target):
-        projectile_size = (self.hitbox.width * 1.5,) * 2
+        projectile_size = self.get_projectile_size(self.hitbox)
 
         # creates projectile
         projectile = AcornThorn(
@@ -212,12 +235,17 @@ class Acorn(RangerEntity):
 
 
 class Newtshroom(RangerEntity):
+    # spores and stomp dust are the same size
+    animation_path = 'enemies/newtshroom'
+    hitbox_scale = (0.45, 0.425)
+    spawned_animations = ('projectiles/spore', 'particles/dust_stomp')
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = 'Newtshroom'
 
         # hitbox
-        self.set_hitbox(0.45, 0.425)
+        self.set_hitbox(*self.hitbox_scale)
         self.set_collision_box(0.45, 0.2, offsety=0.1)
 
         # stats
@@ -235,14 +263,18 @@ class Newtshroom(RangerEntity):
             'attack': 120
         }
 
-        self.set_animation('enemies/newtshroom', isFolder=True)
+        self.set_animation(self.animation_path, isFolder=True)
 
         # attack cooldown
         self.attack_cooldown = 1200
         self.impact_frame = 6
 
+    @staticmethod
+    def get_projectile_size(hitbox: pygame.Rect) -> tuple:
+        return (hitbox.width,) * 2
+
     def create_projectile(self, target):
-        projectile_size = (self.hitbox.width,) * 2
+        projectile_size = self.get_projectile_size(self.hitbox)
 
         # creates projectile
         for angle in range(-15, 30, 15):
@@ -262,7 +294,7 @@ class Newtshroom(RangerEntity):
             projectile.velocity = projectile.velocity.rotate(angle)
 
         # creates stomp dust
-        dust_size = (self.hitbox.width,) * 2
+        dust_size = self.get_projectile_size(self.hitbox)
         dust_pos = list(self.hitbox.midbottom)
         dust_pos[1] -= dust_size[1] / 4
 
@@ -1,6 +1,7 @@
 from constants import *
 from particles import *
 from sprite import Sprite
+from frame_cache import FRAMES
 
 import pygame
 from copy import deepcopy
@@ -27,6 +28,13 @@ class Stats:
 
 
 class Entity(Sprite):
+    # sprite folder and hitbox scale read by both __init__ and prepare
+    animation_path = ''
+    hitbox_scale = (1, 1)
+
+    # sprite folders of the projectiles and particles the entity spawns
+    spawned_animations = ()
+
     def __init__(self, coords: list, size: list, game, groups):
         super().__init__(coords, size, game, groups)
         self.name = ''
@@ -54,13 +62,13 @@ class Entity(Sprite):
         }
 
         # animation cooldowns
-        self.animation_time = pygame.time.get_ticks()
+        self.animation_time = self.game.get_ticks()
         self.animation_cooldowns = {'idle': 0}
         self.animation_cooldown = self.animation_cooldowns[self.action]
 
         # attack times
         self.attacking = False
-        self.attack_time = pygame.time.get_ticks()
+        self.attack_time = self.game.get_ticks()
         self.attack_cooldown = 0
         self.impact_frame = 0
 
@@ -68,13 +76,26 @@ class Entity(Sprite):
         self.draw_shadow = True
         self.shadow_frames = deepcopy(self.animation_frames)
 
+    @classmethod
+    def prepare(cls, size: list):
+        '''Renders the frames of the entity and what it spawns in the background'''
+        FRAMES.prepare(cls.animation_path, size, shadows=True)
+
+        hitbox = pygame.Rect((0, 0), size).scale_by(*cls.hitbox_scale)
+        for filepath in cls.spawned_animations:
+            FRAMES.prepare(filepath, cls.get_projectile_size(hitbox))
+
+    @staticmethod
+    def get_projectile_size(hitbox: pygame.Rect) -> tuple:
+        return hitbox.size
+
     def set_animation(self, filepath: str, isFolder=False):
         '''Sets the animation and corresponding shadows'''
         for facing in self.animation_frames:
             for action in self.animation_cooldowns:
                 path = f'{SPRITE_PATH}/{filepath}/{action}'
 
-                if os.path.exists(path):
+                if IMAGES.has_folder(path):
                     # gets (image, shadow)
                     images = self.get_images(
                         path,
@@ -91,6 +112,11 @@ class Entity(Sprite):
         if self.draw_shadow:
             self.shadow = self.shadow_frames[self.facing][self.action][self.frame]
 
+        # frame sizes may be rounded so the rect is fitted to the image
+        self.rect.size = self.image.get_size()
+        self.rect.center = self.coords
+        self.game.camera_group.relocate(self)
+
         self.animation_cooldown = self.animation_cooldowns[self.action]
 
     def line_of_sight(self, point):
@@ -435,9 +461,9 @@ class Entity(Sprite):
 
             # determines whether the animation cooldown is over
             if (self.animation_cooldown
-                    and pygame.time.get_ticks() - self.animation_time > self.animation_cooldown):
+                    and self.game.get_ticks() - self.animation_time > self.animation_cooldown):
 
-                self.animation_time = pygame.time.get_ticks()
+                self.animation_time = self.game.get_ticks()
                 self.frame += 1
 
     def update(self):
@@ -501,7 +527,7 @@ class MeleeEntity(Entity):
             self.in_combat = True
             self.face_enemy(sprite)
 
-            if pygame.time.get_ticks() - self.attack_time > self.attack_cooldown:
+            if self.game.get_ticks() - self.attack_time > self.attack_cooldown:
                 # trigger attack animation
                 if not self.attacking:
                     self.frame = 0
@@ -515,7 +541,7 @@ class MeleeEntity(Entity):
                     self.targets_hit.append(sprite)
 
         if self.targets_hit:
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = self.game.get_ticks()
             self.targets_hit.clear()
 
         # clear attack animation if not in combat
@@ -587,7 +613,7 @@ class RangerEntity(Entity):
             self.face_enemy(targets[0])  # closest enemy
 
             # only attacks the last frame
-            if (pygame.time.get_ticks() - self.attack_time > self.attack_cooldown):
+            if (self.game.get_ticks() - self.attack_time > self.attack_cooldown):
                 # trigger attack animation
                 if not self.attacking:
                     self.frame = 0
@@ -601,7 +627,7 @@ class RangerEntity(Entity):
 
                 # stops attack animation
                 if self.frame == len(self.animation_frames[self.facing]['attack']) - 1:
-                    self.attack_time = pygame.time.get_ticks()
+                    self.attack_time = self.game.get_ticks()
                     self.attacking = False
 
         # cancels attack when target moves outside attack range
@@ -0,0 +1,172 @@
+from constants import *
+from shadow import Shadow
+from surface_cache import SurfaceCache
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+class FrameCache:
+    def __init__(self, size_step: int, budget: int, workers=None):
+        '''Shares scaled animation frames between sprites of the same asset
+           Frames are evicted least recently used first once over the budget
+           and sprites keep the frames they already hold'''
+        self.size_step = size_step
+        self.shadow_color = (0, 0, 0, 50)
+
+        # frames and shadows keyed by asset path, size and flip
+        # shadows are counted and evicted with their frames
+        self.frames = SurfaceCache(budget)
+        self.shadows = {}
+
+        # frames being rendered in the background keyed the same way
+        # workers never use the display so converting is left to store
+        self.pending = {}
+        self.pool = ThreadPoolExecutor(workers)
+
+    def get_size(self, size: list) -> tuple:
+        '''Rounds the size to the nearest step so similar sizes share frames'''
+        return tuple(
+            max(round(length / self.size_step), 1) * self.size_step
+            for length in size
+        )
+
+    def get_key(self, filepath: str, size: list, flipped: bool, rounded: bool) -> tuple:
+        '''Keys by the exact size unless the size is rounded to share frames'''
+        size = self.get_size(size) if rounded else tuple(size)
+        return os.path.normpath(filepath), size, flipped
+
+    def get_sources(self, filepath: str, isFolder: bool) -> list:
+        '''Returns the unscaled images of the asset'''
+        if isFolder:
+            filenames = IMAGES.get_frame_names(filepath)
+
+        else:
+            # filepath is a single image instead of a sprite folder
+            filenames = [os.path.basename(filepath)]
+
+        return [IMAGES[filename] for filename in filenames]
+
+    def render(self, key: tuple, sources: list, shadows: bool) -> tuple:
+        '''Scales and flips each image, finds its alpha type and casts its shadow'''
+        filepath, size, flipped = key
+
+        images = []
+        for image in sources:
+            image = pygame.transform.scale(image, size)
+
+            if flipped:
+                # flips image over y-axis
+                image = pygame.transform.flip(image, True, False)
+
+            images.append((image, get_alpha_type(image)))
+
+        shadow_surfaces = None
+        if shadows:
+            shadow_surfaces = [
+                Shadow.get_surface(self.shadow_color, image, (*key, i))
+                for i, (image, alpha_type) in enumerate(images)
+            ]
+
+        return images, shadow_surfaces
+
+    def store(self, key: tuple, rendered: tuple):
+        '''Converts rendered frames and shadows to the display format'''
+        images, shadow_surfaces = rendered
+
+        # frames are shared so they are stored immutably
+        frames = tuple(
+            optimize_surface(image, alpha_type)
+            for image, alpha_type in images
+        )
+        self.frames.set(key, frames, SurfaceCache.get_bytes(*frames))
+
+        if shadow_surfaces is not None:
+            self.store_shadows(key, tuple(
+                Shadow.from_surface(self.shadow_color, surface)
+                for surface in shadow_surfaces
+            ))
+
+        self.evict()
+
+    def store_shadows(self, key: tuple, shadows: tuple):
+        self.shadows[key] = shadows
+        self.frames.grow(key, SurfaceCache.get_bytes(
+            *(shadow.surface for shadow in shadows)
+        ))
+
+    def evict(self):
+        # keeps the most recently used frames even if they exceed the budget
+        for key in self.frames.evict():
+            self.shadows.pop(key, None)
+
+    def collect(self, key: tuple):
+        '''Picks up frames rendered in the background
+           Waits for them if they are still being rendered'''
+        future = self.pending.pop(key, None)
+        if future:
+            self.store(key, future.result())
+
+    def prepare(self, filepath: str, size: list, shadows=False, isFolder=True, rounded=False):
+        '''Renders the frames of the animation in worker threads ahead of use
+           Animations split into action folders are prepared for every action'''
+        path = os.path.normpath(f'{SPRITE_PATH}/{filepath}')
+        if isFolder:
+            paths = [
+                folder for folder, frames in IMAGES.folders.items()
+                if frames and (folder == path or os.path.dirname(folder) == path)
+            ]
+
+        else:
+            paths = [path]
+
+        for path in paths:
+            for flipped in (False, True):
+                key = self.get_key(path, size, flipped, rounded)
+                if key in self.frames or key in self.pending:
+                    continue
+
+                # workers are given copies so they never lock shared surfaces
+                sources = [
+                    image.copy()
+                    for image in self.get_sources(path, isFolder)
+                ]
+
+                self.pending[key] = self.pool.submit(
+                    self.render,
+                    key,
+                    sources,
+                    shadows
+                )
+
+    def get_frames(self, filepath: str, size: list, isFolder=False, flipped=False,
+                   rounded=False) -> tuple:
+        key = self.get_key(filepath, size, flipped, rounded)
+        self.collect(key)
+
+        frames = self.frames.get(key)
+        if frames is None:
+            sources = self.get_sources(filepath, isFolder)
+            self.store(key, self.render(key, sources, False))
+            frames = self.frames.get(key)
+
+        return frames
+
+    def get_shadows(self, filepath: str, size: list, isFolder=False, flipped=False,
+                    rounded=False) -> tuple:
+        key = self.get_key(filepath, size, flipped, rounded)
+        self.collect(key)
+
+        if key not in self.shadows:
+            self.store_shadows(key, tuple(
+                Shadow(self.shadow_color, image, (*key, i))
+                for i, image in enumerate(
+                    self.get_frames(filepath, size, isFolder, flipped, rounded)
+                )
+            ))
+
+        return self.shadows[key]
+
+
+# scaled frames shared across all sprites
+FRAMES = FrameCache(FRAME_SIZE_STEP, FRAME_BUDGET)
@@ -0,0 +1,222 @@
+from constants import *
+from surface_cache import SurfaceCache
+
+import pygame
+
+
+class Ground:
+    def __init__(self, level_file, grass_images: list, tile_images: dict,
+                 seed: str, key: str, budget: int, pool, cache):
+        '''Draws chunks of the ground when the camera nears them
+           Chunks are evicted least recently used first once over the budget
+           The key looks up the chunks kept in the disk cache'''
+        self.level_file = level_file
+        self.cols, self.rows = level_file.get_size()
+        self.size = pygame.math.Vector2(
+            self.cols * TILE_SIZE,
+            self.rows * TILE_SIZE
+        )
+
+        # the ground is drawn half a tile up and left of the level origin
+        self.rect = pygame.Rect(
+            -HALF_TILE_SIZE,
+            -HALF_TILE_SIZE,
+            *self.size
+        )
+
+        self.columns = math.ceil(self.size.x / CHUNK_SIZE)
+        self.chunk_rows = math.ceil(self.size.y / CHUNK_SIZE)
+
+        # palettes are scaled once since every chunk draws from them
+        self.grass_palette = self.get_palette(grass_images, (TILE_SIZE * 2,) * 2)
+
+        # tile palette of each ground layer indexed by id
+        self.tile_palettes = {
+            layer: self.get_palette(images, (TILE_SIZE,) * 2)
+            for layer, images in tile_images.items()
+            if layer in level_file.layers
+        }
+
+        # grass of each chunk is scattered by a generator seeded by its coords
+        self.seed = seed
+        self.key = key
+        self.cache = cache
+
+        # chunks in display format
+        self.chunks = SurfaceCache(budget)
+
+        # chunks drawn in the background keyed by their column and row
+        self.pool = pool
+        self.pending = {}
+
+    @staticmethod
+    def get_palette(images: list, size: tuple) -> list:
+        '''Scales the images and converts them to the display format
+           Run-length encoding is skipped as chunks are drawn by several threads'''
+        palette = []
+        for image in images:
+            if image:
+                # images are only enlarged so their alpha is classified unscaled
+                opaque = get_alpha_type(image) == 'opaque'
+
+                image = pygame.transform.scale(image, size)
+                if opaque:
+                    image = image.convert()
+
+                else:
+                    image = image.convert_alpha()
+
+            palette.append(image)
+
+        return palette
+
+    def get_keys(self, view: pygame.Rect) -> list:
+        '''Returns the column and row of each chunk intersecting the view'''
+        view = view.clip(self.rect)
+        if not view:
+            return []
+
+        left = (view.left - self.rect.left) // CHUNK_SIZE
+        top = (view.top - self.rect.top) // CHUNK_SIZE
+        right = (view.right - 1 - self.rect.left) // CHUNK_SIZE
+        bottom = (view.bottom - 1 - self.rect.top) // CHUNK_SIZE
+
+        return [
+            (column, row)
+            for row in range(top, bottom + 1)
+            for column in range(left, right + 1)
+        ]
+
+    def get_area(self, column: int, row: int) -> pygame.Rect:
+        return pygame.Rect(
+            column * CHUNK_SIZE,
+            row * CHUNK_SIZE,
+            CHUNK_SIZE,
+            CHUNK_SIZE
+        ).clip(0, 0, *self.size)
+
+    def get_grass(self, column: int, row: int) -> list:
+        '''Returns the image and coords of the grass scattered over the chunk'''
+        area = self.get_area(column, row)
+        rng = random.Random(f'{self.seed}:{column}:{row}')
+
+        # scales uniform floats since randint is several times slower
+        num_grass = (area.width * area.height) // TILE_SIZE**2 * 2
+        left = area.left - HALF_TILE_SIZE
+        top = area.top - HALF_TILE_SIZE
+        uniform = rng.random
+
+        return [
+            (
+                self.grass_palette[int(uniform() * len(self.grass_palette))],
+                (
+                    left + int(uniform() * (area.width + 1)),
+                    top + int(uniform() * (area.height + 1))
+                )
+            )
+            for i in range(num_grass)
+        ]
+
+    def create_chunk(self, column: int, row: int) -> pygame.Surface:
+        '''Returns the chunk from the disk cache or draws it'''
+        area = self.get_area(column, row)
+        key = self.cache.get_key(self.key, column, row)
+
+        # cached chunks are stored as raw rgb pixels
+        data = self.cache.get(key)
+        if data and len(data) == area.width * area.height * 3:
+            return pygame.image.frombytes(data, area.size, 'RGB')
+
+        chunk = self.draw_chunk(area, column, row)
+        self.cache.set(key, pygame.image.tobytes(chunk, 'RGB'))
+
+        return chunk
+
+    def draw_chunk(self, area: pygame.Rect, column: int, row: int) -> pygame.Surface:
+        '''Draws the grass and terrain within the chunk onto one surface'''
+        # fills with the same green as the screen beneath the layers
+        chunk = pygame.Surface(area.size)
+        chunk.fill(Color.GRASS_GREEN)
+
+        # grass is larger than a tile so neighbouring chunks reach into this one
+        chunk.blits([
+            (grass, (coords[0] - area.left, coords[1] - area.top))
+            for neighbour_row in range(row - 1, row + 2)
+            for neighbour_column in range(column - 1, column + 2)
+            if (0 <= neighbour_column < self.columns
+                and 0 <= neighbour_row < self.chunk_rows)
+            for grass, coords in self.get_grass(neighbour_column, neighbour_row)
+        ], doreturn=False)
+
+        # terrain tiles are aligned to chunks so only cells within it are read
+        for layer, palette in self.tile_palettes.items():
+            cols, rows, ids, cells = self.level_file.layers[layer]
+
+            blits = []
+            for tile_row in range(area.top // TILE_SIZE, area.bottom // TILE_SIZE):
+                start = tile_row * cols
+                for tile_column in range(area.left // TILE_SIZE, area.right // TILE_SIZE):
+                    id = ids[start + tile_column]
+
+                    # id -1 is empty
+                    if id != -1:
+                        blits.append((palette[id], (
+                            tile_column * TILE_SIZE - area.left,
+                            tile_row * TILE_SIZE - area.top
+                        )))
+
+            chunk.blits(blits, doreturn=False)
+
+        return chunk
+
+    def store(self, key: tuple, chunk: pygame.Surface):
+        '''Converts the chunk to the display format and keeps it'''
+        # opaque chunks in display format blit without blending
+        chunk = optimize_surface(chunk)
+
+        self.chunks.set(key, chunk, SurfaceCache.get_bytes(chunk))
+
+    def get_chunk(self, key: tuple) -> pygame.Surface:
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            # waits for chunks already being drawn in the background
+            future = self.pending.pop(key, None)
+            self.store(key, future.result() if future else self.create_chunk(*key))
+            chunk = self.chunks.get(key)
+
+        return chunk
+
+    def prepare(self, view: pygame.Rect):
+        '''Draws the chunks around the view in the background'''
+        keys = self.get_keys(view.inflate(CHUNK_SIZE, CHUNK_SIZE))
+
+        # stops drawing chunks the camera has moved away from
+        for key in list(self.pending):
+            if key not in keys:
+                self.pending.pop(key).cancel()
+
+        for key in keys:
+            if key not in self.chunks and key not in self.pending:
+                self.pending[key] = self.pool.submit(self.create_chunk, *key)
+
+    def visible_chunks(self, view: pygame.Rect):
+        '''Yields each chunk and its world coords intersecting the view'''
+        keys = self.get_keys(view)
+        for key in keys:
+            coords = (
+                self.rect.left + key[0] * CHUNK_SIZE,
+                self.rect.top + key[1] * CHUNK_SIZE
+            )
+
+            yield self.get_chunk(key), coords
+
+        # keeps the visible chunks even if they exceed the budget
+        self.chunks.evict(len(keys))
+        self.prepare(view)
+
+    def clear(self):
+        for future in self.pending.values():
+            future.cancel()
+
+        self.pending.clear()
+        self.chunks.clear()
@@ -1,5 +1,6 @@
 from constants import *
 from sprite import Sprite
+from text_cache import TEXT
 from ui import Button
 
 import pygame
@@ -145,11 +146,7 @@ class Inventory(pygame.sprite.Group):
 
                 # displays item count when the player has multiple copies
                 if item.count > 1:
-                    text = COMICORO[25].render(
-                        str(item.count),
-                        True,
-                        Color.BLACK
-                    )
+                    text = TEXT.render(str(item.count), 25, Color.BLACK)
 
                     text_rect = text.get_rect(bottomright=(
                         item.rect.right - self.MARGIN // 3,
@@ -221,12 +218,15 @@ class Inventory(pygame.sprite.Group):
     def render(self):
         if self.inventory_button.active:
             self.show_inventory()
-            self.scroll_inventory()
 
         self.inventory_button.draw(self.screen)
 
     def update(self):
         """Handles events"""
+        # scrolls once per tick so scrolling does not depend on the frame rate
+        if self.inventory_button.active:
+            self.scroll_inventory()
+
         for sprite in self.sprites():
             sprite.update()
 
@@ -4,13 +4,73 @@ from tiles import *
 from enemies import *
 from entity import *
 from sprite import Sprite
+from ground import Ground
 from spells import *
+from level_file import LevelFile
+from disk_cache import DiskCache
+from frame_cache import FRAMES
+from shadow import Shadow
+
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
-import csv
+import struct
+import time
+
+
+class Floor:
+    def __init__(self, level_file: LevelFile):
+        '''Ground and sprites of a floor built ahead of time outside of the sprite groups'''
+        self.level_file = level_file
+        self.ground = None
+
+        # groups each sprite joins once the floor is swapped in
+        self.sprites = {}
+
+        # walls and decor that never move
+        self.static_sprites = []
+
+        self.player_coords = None
+
+    def add(self, sprite, *groups):
+        self.sprites[sprite] = list(groups)
 
 
 class Level:
+    # sprites of terrain and terrain overlay ids
+    terrain_sprites = [f'path{i}' for i in range(1, 32)]
+    overlay_sprites = [f'bricks{i}' for i in range(1, 5)] \
+        + [f'ditch{i}' for i in range(1, 5)] \
+        + [f'grassy_patch{i}' for i in range(1, 9)]
+
+    # layers drawn into the ground instead of creating sprites
+    ground_layers = ('terrain', 'terrain_overlay')
+
+    # sprites of wall ids
+    wall_sprites = ('brick_top', 'brick_middle', 'brick_bottom', 'brick_pile', 'brick_side')
+
+    # animation, size in tiles, pixels of random offset and hitbox of static decor
+    static_decor = {
+        0: ('flower1', 0.9, 25, (0.25, 0.3)),
+        1: ('bush1', 0.8, 25, (0.6, 0.5)),
+        2: ('bush2', 0.8, 25, (0.6, 0.3)),
+        3: ('rock1', 0.7, 25, (0.4, 0.2)),
+        4: ('rock2', 0.5, 25, (0.325, 0.3)),
+        5: ('rock3', 0.5, 25, (0.3, 0.2)),
+        6: ('rock4', 0.5, 25, (0.3, 0.3)),
+        7: ('oak_tree1', 2, 50, (0.4, 0.6)),
+        8: ('pine_tree1', 2, 50, (0.3, 0.6)),
+        9: ('sakura_tree1', 2, 50, (0.3, 0.5, 0, 0.08)),
+        10: ('dead_tree1', 1.8, 50, (0.3, 0.65))
+    }
+
+    # id, coords, size and flip of a cached static decor placement
+    decor_record = struct.Struct('<hiiH?')
+
+    # bump when ground chunks or decor placement change to invalidate cached floors
+    version = 2
+    cache = DiskCache(f'{CACHE_PATH}/floors', DISK_CACHE, DISK_CACHE_BUDGET)
+
     def __init__(self, floor_level: int, game):
         self.screen = pygame.display.get_surface()
         self.game = game
@@ -20,6 +80,9 @@ class Level:
 
         self.floor_level = floor_level
         self.level_updated = False
+
+        # 0 is fully lit and 255 is pitch black outside of lights
+        self.ambient_darkness = 0
         self.transitioning = False
 
         self.level_transition_rect = pygame.Rect(
@@ -29,12 +92,27 @@ class Level:
             self.game.height
         )
 
-        # layers
-        self.grass_layer = None
-        self.terrain_layer = None
-        self.terrain_overlay_layer = None
+        self.ground = None
+
+        # walls and decor that never move
+        self.static_sprites = []
+
+        # the next floor is read by a worker during play and its frames
+        # and ground are prepared once it has been read
+        # ground chunks near the camera are drawn by the same worker
+        # the worker never uses the display so images and surfaces are
+        # converted on the main thread
+        self.pool = ThreadPoolExecutor(1)
+        self.pending = {}
+        self.prefetched = {}
+
+        # sprites of prefetched floors are built for up to this many
+        # milliseconds each tick
+        self.building = {}
+        self.build_time = 2
 
         self.read_csv_level()
+        self.prefetch_level(self.floor_level + 1)
 
     def transition_level(self):
         '''Draws rectangle to cover screen as level transitions'''
@@ -61,46 +139,194 @@ class Level:
                 self.transitioning = False
                 self.level_updated = False
 
+                # the next floor is read once the wipe no longer needs the frame time
+                self.prefetch_level(self.floor_level + 1)
+
     def read_csv_level(self):
-        files = os.listdir(f'{LEVEL_PATH}/{self.floor_level}')
-
-        # reads csv files in folder
-        for row, path in enumerate(files):
-            # checks if file is not csv
-            file_extention = os.path.splitext(path)[1]
-            if file_extention != '.csv':
-                raise Exception(
-                    f'File "{path}" is not recognized as a csv file.'
+        # swaps in the floor prefetched during the previous floor
+        if self.floor_level not in self.prefetched:
+            self.collect_level(self.floor_level)
+
+        # finishes building sprites the previous floor had no time for
+        for step in self.building.pop(self.floor_level, ()):
+            pass
+
+        floor = self.prefetched.pop(self.floor_level)
+        self.ground = floor.ground
+        self.static_sprites = floor.static_sprites
+
+        # determines the dimensions of the first layer
+        self.size.xy = self.ground.size
+        self.rect = pygame.Rect(0, 0, *self.size)
+
+        for sprite, groups in floor.sprites.items():
+            sprite.add(*groups)
+            self.game.camera_group.relocate(sprite)
+
+        if floor.player_coords:
+            self.game.player.set_coords(*floor.player_coords)
+
+    def build_level(self, floor_level: int, floor: Floor, key: str, static_decor: list):
+        '''Prepares the frames and ground of the floor, creates its sprites and
+           bakes its static sprites
+           Yields after each step so building is spread across ticks'''
+        # images are converted on first use so frames are only queued from here
+        yield from self.prepare_frames(floor.level_file, static_decor)
+
+        floor.ground = self.create_ground(floor_level, floor.level_file, key)
+        yield
+
+        for name in floor.level_file.layers:
+            yield from self.create_tile_group(floor, name)
+
+        for id, x, y, size, flipped in static_decor:
+            self.add_static_decor(floor, id, [x, y], size, flipped)
+            yield
+
+        yield from self.bake_static_sprites(floor)
+
+    def build_levels(self):
+        '''Builds the sprites of prefetched floors until out of time for the tick'''
+        end_time = time.perf_counter() + self.build_time / 1000
+        for floor_level, steps in list(self.building.items()):
+            for step in steps:
+                if time.perf_counter() > end_time:
+                    return
+
+            del self.building[floor_level]
+
+    def prefetch_level(self, floor_level: int):
+        '''Reads the floor in the background while the current one is played'''
+        if (not os.path.isdir(f'{LEVEL_PATH}/{floor_level}')
+                or floor_level in self.pending
+                or floor_level in self.prefetched):
+            return
+
+        self.pending[floor_level] = self.pool.submit(self.load_level, floor_level)
+
+    def load_level(self, floor_level: int) -> tuple:
+        '''Reads the floor and places its static decor'''
+        level_file = self.load_level_file(floor_level)
+
+        # baked floors are cached under everything that changes how they look
+        key = self.cache.get_key(
+            self.version,
+            level_file.signature,
+            IMAGES.signature,
+            LEVEL_SEED,
+            floor_level,
+            TILE_SIZE,
+            CHUNK_SIZE
+        )
+
+        static_decor = self.load_static_decor(level_file, self.get_seed(floor_level), key)
+
+        # entries of floors and shadows whose files or images changed
+        # are never used again
+        self.cache.prune()
+        Shadow.cache.prune()
+
+        return level_file, key, static_decor
+
+    def get_seed(self, floor_level: int) -> str:
+        '''Returns the seed that scatters the grass and decor of the floor
+           Unlike cache keys it stays the same when the files are touched'''
+        return f'{LEVEL_SEED}:{floor_level}'
+
+    def collect_level(self, floor_level: int):
+        '''Picks up the floor read in the background and starts building it,
+           waiting for it if it is still being read'''
+        future = self.pending.pop(floor_level, None)
+        level_file, key, static_decor = (
+            future.result() if future else self.load_level(floor_level)
+        )
+
+        # the floor is built a few steps at a time while the current one is played
+        floor = Floor(level_file)
+        self.prefetched[floor_level] = floor
+        self.building[floor_level] = self.build_level(
+            floor_level, floor, key, static_decor
+        )
+
+    def create_ground(self, floor_level: int, level_file: LevelFile, key: str) -> Ground:
+        # ground chunks are drawn as the camera nears them
+        # grass is scattered the same way on every visit for the same seed
+        # while cached chunks are looked up by the key
+        ground = Ground(
+            level_file,
+            [IMAGES[f'grass{i}'] for i in range(1, 8)],
+            {
+                'terrain': self.get_tile_images(
+                    level_file, 'terrain', self.terrain_sprites
+                ),
+                'terrain_overlay': self.get_tile_images(
+                    level_file, 'terrain_overlay', self.overlay_sprites
                 )
+            },
+            self.get_seed(floor_level),
+            key,
+            GROUND_BUDGET,
+            self.pool,
+            self.cache
+        )
+
+        # starts with the chunks around where the player spawns
+        for id, col_index, row_index in level_file.get_tiles('player'):
+            view = pygame.Rect(0, 0, *self.game.resolution)
+            view.center = (col_index * TILE_SIZE, row_index * TILE_SIZE)
+            ground.prepare(view)
+
+        return ground
 
-            # reads csv
-            with open(os.path.join(f'{LEVEL_PATH}/{self.floor_level}', path)) as file:
-                csv_file = tuple(csv.reader(file))
-                if not row:  # determines the dimensions of the first csv_file
-                    self.size.x = len(csv_file[0]) * TILE_SIZE
-                    self.size.y = len(csv_file) * TILE_SIZE
-                    self.rect = pygame.Rect(0, 0, *self.size)
+    def get_tile_images(self, level_file: LevelFile, name: str, sprites: list) -> list:
+        '''Returns the images of the ids used by the layer indexed by id'''
+        ids = level_file.get_ids(name)
+        return [
+            IMAGES[sprite] if id in ids else None
+            for id, sprite in enumerate(sprites)
+        ]
 
-                    # initializes layers
-                    self.grass_layer = pygame.Surface(
-                        self.size,
-                        pygame.SRCALPHA
-                    )
+    def bake_static_sprites(self, floor: Floor):
+        '''Pre-renders static sprites into batches by depth band and chunk'''
+        columns = {}
+        for sprite in floor.static_sprites:
+            # animated sprites are left to be drawn every frame
+            if len(sprite.animation_frames[sprite.facing]) > 1:
+                continue
 
-                    self.terrain_layer = pygame.Surface(
-                        self.size,
-                        pygame.SRCALPHA
-                    )
+            column = (sprite.sprite_layer, sprite.hitbox.centerx // CHUNK_SIZE)
+            if column not in columns:
+                columns[column] = []
 
-                    self.terrain_overlay_layer = pygame.Surface(
-                        self.size,
-                        pygame.SRCALPHA
-                    )
+            columns[column].append(sprite)
 
-                self.create_tile_group(csv_file, path)
+        # bands start at the highest bottom so no sprite in one is further
+        # than the band height from the depth of the batch
+        for sprites in columns.values():
+            sprites.sort(key=lambda sprite: sprite.hitbox.bottom)
 
-        # draws grass
-        self.add_grass()
+            band = []
+            for sprite in sprites:
+                if band and sprite.hitbox.bottom - band[0].hitbox.bottom > STATIC_BAND_HEIGHT:
+                    self.bake_band(floor, band)
+                    band = []
+                    yield
+
+                band.append(sprite)
+
+            self.bake_band(floor, band)
+            yield
+
+    def bake_band(self, floor: Floor, sprites: list):
+        # sprites alone in their band are drawn as they are
+        if len(sprites) < 2:
+            return
+
+        floor.add(StaticBatch(sprites, self.game, ()), self.game.camera_group)
+
+        # baked sprites are no longer drawn but walls still collide
+        for sprite in sprites:
+            floor.sprites[sprite].remove(self.game.camera_group)
 
     def clear_level(self):
         '''Deletes all sprites except for the player'''
@@ -109,178 +335,138 @@ class Level:
                 sprite.kill()
                 del sprite
 
-    def create_tile_group(self, csv_file, path: str):
-        '''Creates tiles from csv data'''
+        for sprite in self.static_sprites:
+            sprite.kill()
+
+        self.static_sprites.clear()
+
+        # chunks of the previous floor are no longer drawn
+        self.ground.clear()
+
+    def load_level_file(self, floor_level: int) -> LevelFile:
+        return LevelFile.load(
+            f'{LEVEL_PATH}/{floor_level}',
+            LEVEL_CACHE_PATH,
+            DISK_CACHE
+        )
+
+    def create_tile_group(self, floor: Floor, name: str):
+        '''Creates tiles from the occupied cells of the layer one at a time'''
         create_tile = {
             'player': self.set_player_coords,
-            'terrain': self.add_terrain,
-            'terrain_overlay': self.add_terrain_overlay,
             'walls': self.add_walls,
             'enemies': self.add_enemies,
             'chests': self.add_chests,
-            'static_decor': self.add_static_decor,
             'animated_decor': self.add_animated_decor,
             'totems': self.add_totems
         }
 
-        if path[:-4] not in create_tile:
-            raise Exception(f'The csv file "{path}" is invalid.')
-
-        # creates sprite according to csv data of ids
-        for row_index, row in enumerate(csv_file):
-            for col_index, id in enumerate(row):
-                id = int(id)
-
-                # id -1 is empty
-                if id != -1 and id >= 0:
-                    x = col_index * TILE_SIZE
-                    y = row_index * TILE_SIZE
-                    create_tile[path[:-4]](id, [x, y])
-
-                else:
-                    # corrupted csv
-                    if id < -1:
-                        raise Exception(
-                            f'Unexpected value was found in csv file "{path}".'
-                        )
-
-    def set_player_coords(self, id: int, coords: list):
-        self.game.player.set_coords(*coords)
-
-    def add_grass(self):
-        '''Places a lot of grass'''
-        num_grass = (self.size.x * self.size.y) // TILE_SIZE**2 * 2
-        grass_size = (TILE_SIZE * 2,) * 2
-
-        # draws grass onto surface
-        for i in range(int(num_grass)):
-            filename = f'grass{random.randint(1, 7)}'
-            coords = (
-                random.randint(-HALF_TILE_SIZE, self.size.x + HALF_TILE_SIZE),
-                random.randint(-HALF_TILE_SIZE, self.size.y + HALF_TILE_SIZE)
-            )
+        # terrain is drawn into the ground chunks as they are streamed
+        # and static decor is placed ahead by load_static_decor
+        if name in self.ground_layers or name == 'static_decor':
+            return
 
-            grass = pygame.transform.scale(
-                IMAGES[filename],
-                grass_size
-            )
+        if name not in create_tile:
+            raise Exception(f'The csv file "{name}.csv" is invalid.')
 
-            self.grass_layer.blit(grass, coords)
+        # creates sprite according to ids of occupied cells
+        for id, col_index, row_index in floor.level_file.get_tiles(name):
+            x = col_index * TILE_SIZE
+            y = row_index * TILE_SIZE
+            create_tile[name](floor, id, [x, y])
+            yield
 
-    def add_terrain(self, id: int, coords: list):
-        sprites = [f'path{i}' for i in range(1, 32)]
+    def set_player_coords(self, floor: Floor, id: int, coords: list):
+        floor.player_coords = coords
 
-        terrain_size = (TILE_SIZE,) * 2
-        terrain = pygame.transform.scale(
-            IMAGES[sprites[id]],
-            terrain_size
-        )
-
-        self.terrain_layer.blit(terrain, coords)
-
-    def add_terrain_overlay(self, id: int, coords: list):
-        sprites = [f'bricks{i}' for i in range(1, 5)] \
-            + [f'ditch{i}' for i in range(1, 5)] \
-            + [f'grassy_patch{i}' for i in range(1, 9)]
-
-        overlay_size = (TILE_SIZE,) * 2
-        overlay = pygame.transform.scale(
-            IMAGES[sprites[id]],
-            overlay_size
-        )
-
-        self.terrain_overlay_layer.blit(overlay, coords)
-
-    def add_walls(self, id: int, coords: list):
+    def add_walls(self, floor: Floor, id: int, coords: list):
         size = (TILE_SIZE,) * 2
-        wall = Sprite(
-            coords,
-            size,
-            self.game,
-            (self.game.camera_group, self.game.collision_group)
-        )
+        wall = Sprite(coords, size, self.game, ())
+        floor.add(wall, self.game.camera_group, self.game.collision_group)
 
         wall.sprite_layer = 3
-        
+        floor.static_sprites.append(wall)
+
+        # only brick piles stand apart from walls to cast shadows
+        wall.draw_shadow = id == 3
+        wall.set_animation(self.wall_sprites[id])
 
         match id:
             case 0:
-                wall.set_animation('brick_top')
                 wall.set_collision_box(1, 0.8, offsety=0.1)
 
             case 1:
-                wall.set_animation('brick_middle')
                 wall.set_collision_box(1, 1.2, offsety=-0.1)
 
             case 2:
-                wall.set_animation('brick_bottom')
                 wall.set_collision_box(1, 1.2, offsety=-0.1)
 
             case 3:
-                wall.draw_shadow = True
-                wall.set_animation('brick_pile')
                 wall.set_hitbox(0.7, 0.4, offsety=0.05)
                 wall.set_collision_box(0.7, 0.4, offsety=0.05)
 
             case 4:
-                wall.set_animation('brick_side')
                 wall.set_collision_box(1, 0.8, offsety=0.1)
 
-    def add_enemies(self, id: int, coords: list):
+    def get_enemy_type(self, id: int):
+        '''Returns the enemy class and size of the enemy id'''
         match id:
             case 0:
-                enemy = Ghost(
-                    coords,
-                    (TILE_SIZE * 0.7,) * 2,
-                    self.game,
-                    (self.game.camera_group, self.game.enemy_group)
-                )
+                return Ghost, (TILE_SIZE * 0.7,) * 2
 
             case 1:
-                enemy = Mimic(
-                    coords,
-                    (TILE_SIZE * 0.8,) * 2,
-                    self.game,
-                    (self.game.camera_group, self.game.enemy_group)
-                )
+                return Mimic, (TILE_SIZE * 0.8,) * 2
 
             case 2:
-                enemy = Sunflower(
-                    coords,
-                    (TILE_SIZE * 0.9,) * 2,
-                    self.game,
-                    (self.game.camera_group, self.game.enemy_group)
-                )
+                return Sunflower, (TILE_SIZE * 0.9,) * 2
 
             case 3:
-                enemy = Acorn(
-                    coords,
-                    (TILE_SIZE * 0.6,) * 2,
-                    self.game,
-                    (self.game.camera_group, self.game.enemy_group)
-                )
+                return Acorn, (TILE_SIZE * 0.6,) * 2
 
             case 4:
-                enemy = Newtshroom(
-                    coords,
-                    (TILE_SIZE * 0.8,) * 2,
-                    self.game,
-                    (self.game.camera_group, self.game.enemy_group)
-                )
+                return Newtshroom, (TILE_SIZE * 0.8,) * 2
+
+    def add_enemies(self, floor: Floor, id: int, coords: list):
+        enemy_type, size = self.get_enemy_type(id)
+        enemy = enemy_type(coords, size, self.game, ())
+        floor.add(enemy, self.game.camera_group, self.game.enemy_group)
 
         enemy.set_coords(
             enemy.coords.x + random.randint(-25, 25),
             enemy.coords.y + random.randint(-25, 25)
         )
 
-    def add_chests(self, id: int, coords: list):
+    def prepare_frames(self, level_file: LevelFile, static_decor: list):
+        '''Renders the frames of the enemies, walls and static decor on the floor
+           in the background, yielding between kinds of sprites'''
+        for id in level_file.get_ids('enemies'):
+            enemy_type, size = self.get_enemy_type(id)
+            enemy_type.prepare(size)
+            yield
+
+        for id in level_file.get_ids('walls'):
+            FRAMES.prepare(
+                self.wall_sprites[id],
+                (TILE_SIZE,) * 2,
+                shadows=id == 3,
+                isFolder=False
+            )
+
+        # decor of the same kind and size shares frames
+        for id, size in {(id, size) for id, x, y, size, flipped in static_decor}:
+            yield
+            FRAMES.prepare(
+                self.static_decor[id][0],
+                (size,) * 2,
+                shadows=True,
+                isFolder=False,
+                rounded=True
+            )
+
+    def add_chests(self, floor: Floor, id: int, coords: list):
         size = (TILE_SIZE * 0.9,) * 2
-        chest = WoodChest(
-            coords,
-            size,
-            self.game,
-            (self.game.camera_group, self.game.collision_group)
-        )
+        chest = WoodChest(coords, size, self.game, ())
+        floor.add(chest, self.game.camera_group, self.game.collision_group)
 
         chest.items = {
             'baguette': random.randint(1, 3),
@@ -294,262 +480,76 @@ class Level:
             ()
         )
 
-    def add_static_decor(self, id: int, coords: list):
-        match id:
-            case 0:
-                size = (round(randomize(TILE_SIZE * 0.9, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('flower1')
-                decor.set_hitbox(0.25, 0.3)
-
-            case 1:
-                size = (round(randomize(TILE_SIZE * 0.8, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('bush1')
-                decor.set_hitbox(0.6, 0.5)
-
-            case 2:
-                size = (round(randomize(TILE_SIZE * 0.8, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('bush2')
-                decor.set_hitbox(0.6, 0.3)
-
-            case 3:
-                size = (round(randomize(TILE_SIZE * 0.7, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('rock1')
-                decor.set_hitbox(0.4, 0.2)
-
-            case 4:
-                size = (round(randomize(TILE_SIZE * 0.5, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('rock2')
-                decor.set_hitbox(0.325, 0.3)
-
-            case 5:
-                size = (round(randomize(TILE_SIZE * 0.5, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('rock3')
-                decor.set_hitbox(0.3, 0.2)
-
-            case 6:
-                size = (round(randomize(TILE_SIZE * 0.5, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-25, 25)
-                coords[1] += random.randint(-25, 25)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('rock4')
-                decor.set_hitbox(0.3, 0.3)
-
-            case 7:
-                size = (round(randomize(TILE_SIZE * 2, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-50, 50)
-                coords[1] += random.randint(-50, 50)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('oak_tree1')
-                decor.set_hitbox(0.4, 0.6)
-
-            case 8:
-                size = (round(randomize(TILE_SIZE * 2, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-50, 50)
-                coords[1] += random.randint(-50, 50)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('pine_tree1')
-                decor.set_hitbox(0.3, 0.6)
-
-            case 9:
-                size = (round(randomize(TILE_SIZE * 2, 0.1)), ) * 2
-
-                # randomly offsets
-                coords[0] += random.randint(-50, 50)
-                coords[1] += random.randint(-50, 50)
-
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
-
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
-
-                decor.set_animation('sakura_tree1')
-                decor.set_hitbox(0.3, 0.5, offsety=0.08)
-
-            case 10:
-                size = (round(randomize(TILE_SIZE * 1.8, 0.1)), ) * 2
+    def place_static_decor(self, level_file: LevelFile, seed: str) -> list:
+        '''Returns the id, coords, size and flip of every static decor'''
+        rng = random.Random(seed)
+        placements = []
+        for id, col_index, row_index in level_file.get_tiles('static_decor'):
+            animation, scale, spread, hitbox = self.static_decor[id]
+            size = round(randomize(TILE_SIZE * scale, 0.1, rng))
+
+            # randomly offsets
+            x = col_index * TILE_SIZE + rng.randint(-spread, spread)
+            y = row_index * TILE_SIZE + rng.randint(-spread, spread)
+
+            placements.append((id, x, y, size, bool(rng.randint(0, 1))))
+
+        return placements
+
+    def load_static_decor(self, level_file: LevelFile, seed: str, key: str) -> list:
+        '''Returns the static decor placement from the disk cache or places it'''
+        # cached placements are stored as packed records
+        data = self.cache.get(self.cache.get_key(key, 'static_decor'))
+        if data is not None:
+            return list(self.decor_record.iter_unpack(data))
+
+        placements = self.place_static_decor(level_file, seed)
+        self.cache.set(
+            self.cache.get_key(key, 'static_decor'),
+            b''.join(self.decor_record.pack(*placement) for placement in placements)
+        )
 
-                # randomly offsets
-                coords[0] += random.randint(-50, 50)
-                coords[1] += random.randint(-50, 50)
+        return placements
 
-                decor = Sprite(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
+    def add_static_decor(self, floor: Floor, id: int, coords: list, size: int, flipped: bool):
+        animation, scale, spread, hitbox = self.static_decor[id]
+        decor = Sprite(coords, (size,) * 2, self.game, ())
+        floor.add(decor, self.game.camera_group)
 
-                decor.sprite_layer = 3
-                decor.draw_shadow = True
+        decor.sprite_layer = 3
+        decor.draw_shadow = True
+        decor.round_size = True
 
-                decor.set_animation('dead_tree1')
-                decor.set_hitbox(0.3, 0.65)
+        decor.set_animation(animation)
+        decor.set_hitbox(*hitbox)
 
         # randomly flips sprite vertically
-        if random.randint(0, 1):
+        if flipped:
             decor.facing = 'left'
 
-    def add_animated_decor(self, id: int, coords: list):
+        floor.static_sprites.append(decor)
+
+    def add_animated_decor(self, floor: Floor, id: int, coords: list):
         match id:
             case 0:
                 size = (round(randomize(TILE_SIZE, 0.1)), ) * 2
-                decor = Torch(
-                    coords,
-                    size,
-                    self.game,
-                    self.game.camera_group
-                )
+                decor = Torch(coords, size, self.game, ())
+                floor.add(decor, self.game.camera_group)
 
-    def add_totems(self, id: int, coords: list):
+    def add_totems(self, floor: Floor, id: int, coords: list):
         match id:
             case 0:
-                totem = Totem1(
-                    coords,
-                    (TILE_SIZE,) * 2,
-                    self.game,
-                    (self.game.camera_group,
-                     self.game.enemy_group, self.game.totem_group)
-                )
+                totem = Totem1(coords, (TILE_SIZE,) * 2, self.game, ())
 
             case 1:
-                totem = Totem2(
-                    coords,
-                    (TILE_SIZE,) * 2,
-                    self.game,
-                    (self.game.camera_group,
-                     self.game.enemy_group, self.game.totem_group)
-                )
+                totem = Totem2(coords, (TILE_SIZE,) * 2, self.game, ())
+
+        floor.add(
+            totem,
+            self.game.camera_group,
+            self.game.enemy_group,
+            self.game.totem_group
+        )
 
     def render(self):
         if self.transitioning:
@@ -562,3 +562,12 @@ class Level:
     def update(self):
         """Handles events"""
         self.transition_level()
+
+        # prepares floors the worker has finished reading
+        for floor_level in [
+            floor_level for floor_level, future in self.pending.items()
+            if future.done()
+        ]:
+            self.collect_level(floor_level)
+
+        self.build_levels()
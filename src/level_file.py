@@ -0,0 +1,189 @@
+import array
+import csv
+import hashlib
+import mmap
+import os
+import struct
+
+from disk_cache import DiskCache
+
+
+class LevelFile:
+    # bump when the file format changes to invalidate compiled levels
+    version = 2
+    magic = b'NVLV'
+
+    # magic, version, csv signature and number of layers
+    header = struct.Struct('<4sH40sH')
+
+    # name, array type, columns, rows, occupied cells and offsets of both arrays
+    layer_header = struct.Struct('<16scHHIII')
+
+    def __init__(self, buffer):
+        '''Reads the layers of a compiled level without copying them'''
+        self.buffer = memoryview(buffer)
+
+        magic, version, signature, num_layers = self.header.unpack_from(buffer)
+        if magic != self.magic or version != self.version:
+            raise ValueError('The level file is not of the current format.')
+
+        self.signature = signature.decode()
+
+        # layers are kept in the order the csv files were listed
+        self.layers = {}
+        offset = self.header.size
+        for i in range(num_layers):
+            (name, typecode, cols, rows, num_cells,
+                ids_offset, cells_offset) = self.layer_header.unpack_from(buffer, offset)
+
+            offset += self.layer_header.size
+
+            typecode = typecode.decode()
+            ids_size = cols * rows * struct.calcsize(typecode)
+            self.layers[name.rstrip(b'\0').decode()] = (
+                cols,
+                rows,
+                self.buffer[ids_offset:ids_offset + ids_size].cast(typecode),
+                self.buffer[cells_offset:cells_offset + num_cells * 4].cast('I')
+            )
+
+    @staticmethod
+    def get_signature(path: str) -> str:
+        '''Hashes the name, size and modified time of every file of the floor'''
+        signature = hashlib.sha1()
+        for name in sorted(os.listdir(path)):
+            stat = os.stat(os.path.join(path, name))
+            signature.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+
+        return signature.hexdigest()
+
+    @staticmethod
+    def load(path: str, cache_path: str, enabled=True):
+        '''Returns the compiled level and compiles it first if it is missing or stale'''
+        signature = LevelFile.get_signature(path)
+        filepath = os.path.join(cache_path, f'{os.path.basename(path)}.lvl')
+
+        if enabled:
+            try:
+                with open(filepath, 'rb') as file:
+                    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+                level = LevelFile(buffer)
+                if level.signature == signature:
+                    return level
+
+            except (OSError, ValueError, struct.error):
+                pass
+
+        data = LevelFile.compile(path, signature)
+        if enabled:
+            DiskCache.write(filepath, data)
+
+        return LevelFile(data)
+
+    @staticmethod
+    def compile(path: str, signature=None) -> bytes:
+        '''Packs the csv files of a floor into id arrays and lists of occupied cells'''
+        layers = []
+        for filename in os.listdir(path):
+            # checks if file is not csv
+            name, file_extention = os.path.splitext(filename)
+            if file_extention != '.csv':
+                raise Exception(
+                    f'File "{filename}" is not recognized as a csv file.'
+                )
+
+            with open(os.path.join(path, filename)) as file:
+                rows = [[int(id) for id in row] for row in csv.reader(file) if row]
+
+            ids = [id for row in rows for id in row]
+
+            # id -1 is empty
+            if any(id < -1 for id in ids):
+                raise Exception(
+                    f'Unexpected value was found in csv file "{filename}".'
+                )
+
+            # most layers have fewer than 128 kinds of tiles
+            typecode = 'b' if max(ids, default=0) < 128 else 'h'
+            layers.append((
+                name,
+                typecode,
+                len(rows[0]) if rows else 0,
+                len(rows),
+                array.array(typecode, ids),
+                array.array('I', [i for i, id in enumerate(ids) if id != -1])
+            ))
+
+        header = LevelFile.header.pack(
+            LevelFile.magic,
+            LevelFile.version,
+            (signature or LevelFile.get_signature(path)).encode(),
+            len(layers)
+        )
+
+        # headers are padded so the arrays that follow are aligned to four bytes
+        offset = len(header) + LevelFile.layer_header.size * len(layers)
+        padding = bytes(-offset % 4)
+        offset += len(padding)
+        layer_headers = []
+        data = []
+        for name, typecode, cols, rows, ids, cells in layers:
+            ids_offset = offset
+            ids = ids.tobytes()
+            ids += bytes(-len(ids) % 4)
+
+            cells_offset = ids_offset + len(ids)
+            cells = cells.tobytes()
+
+            layer_headers.append(LevelFile.layer_header.pack(
+                name.encode(),
+                typecode.encode(),
+                cols,
+                rows,
+                len(cells) // 4,
+                ids_offset,
+                cells_offset
+            ))
+
+            data += [ids, cells]
+            offset = cells_offset + len(cells)
+
+        return b''.join([header, *layer_headers, padding, *data])
+
+    def get_size(self) -> tuple:
+        '''Returns the columns and rows of the first layer'''
+        cols, rows, ids, cells = next(iter(self.layers.values()))
+        return cols, rows
+
+    def get_tiles(self, name: str):
+        '''Yields the id, column and row of every occupied cell of the layer'''
+        if name not in self.layers:
+            return
+
+        cols, rows, ids, cells = self.layers[name]
+        for cell in cells:
+            yield ids[cell], cell % cols, cell // cols
+
+    def get_ids(self, name: str) -> set:
+        '''Returns the ids used in the layer'''
+        if name not in self.layers:
+            return set()
+
+        cols, rows, ids, cells = self.layers[name]
+        return {ids[cell] for cell in cells}
+
+
+if __name__ == '__main__':
+    from constants import *
+    import time
+
+    start = time.perf_counter()
+    floors = sorted(os.listdir(LEVEL_PATH))
+    for floor in floors:
+        LevelFile.load(f'{LEVEL_PATH}/{floor}', LEVEL_CACHE_PATH)
+
+    print(
+        f'compiled {len(floors)} floors '
+        f'in {(time.perf_counter() - start) * 1000:.0f} ms'
+    )
@@ -1,5 +1,6 @@
 from constants import *
 from sprite import Sprite
+from text_cache import TEXT
 
 import pygame
 
@@ -20,7 +21,7 @@ class Particle(Sprite):
 
         # fade
         self.fade = True
-        self.fade_time = pygame.time.get_ticks()
+        self.fade_time = self.game.get_ticks()
         self.fade_cooldown = 1000
 
         # hitboxes are not used for collision
@@ -39,9 +40,11 @@ class Particle(Sprite):
     def expire(self):
         '''Fades particle after its fade time
            Deletes the particle if it has no alpha'''
-        if pygame.time.get_ticks() - self.fade_time > self.fade_cooldown:
+        if self.game.get_ticks() - self.fade_time > self.fade_cooldown:
             self.alpha -= 8
             if self.alpha > 0 and self.fade:
+                # fades a copy since frames are shared between sprites
+                self.image = self.image.copy()
                 self.image.set_alpha(self.alpha)
 
             else:
@@ -120,9 +123,7 @@ class Explosion1(Particle):
         self.set_animation('particles/explosion1_', isFolder=True)
 
         # light
-        self.draw_light = True
-        self.light_color = Color.GOLD
-        self.light_radius = 30
+        self.set_light(Color.GOLD, 30)
 
 
 class Explosion2(Particle):
@@ -166,5 +167,6 @@ class TextPopUp(Particle):
         super().__init__(coords, (0, 0), game, group)
 
     def set_text(self, text, font_size, color):
-        self.image = COMICORO[font_size].render(text, True, color)
+        self.image = TEXT.render(text, font_size, color)
         self.rect = self.image.get_rect(center=self.coords)
+        self.game.camera_group.relocate(self)
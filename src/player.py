@@ -54,7 +54,7 @@ class Player(Entity):
 
         # dash
         self.dashing = False
-        self.dash_time = pygame.time.get_ticks()
+        self.dash_time = self.game.get_ticks()
         self.dash_cooldown = 1000
         self.dash_duration = 650  # how long a dash lasts
 
@@ -62,7 +62,7 @@ class Player(Entity):
         self.casting = True
         self.cast_phase = -1
         self.cast_phases = ('cast_anticip', 'cast_action', 'cast_recover')
-        self.cast_time = pygame.time.get_ticks()
+        self.cast_time = self.game.get_ticks()
 
         # inventory
         inventory_rect_width = TILE_SIZE * 4
@@ -149,7 +149,7 @@ class Player(Entity):
         # prevents player from moving
         self.in_combat = True
 
-        if pygame.time.get_ticks() - self.attack_time > self.attack_cooldown:
+        if self.game.get_ticks() - self.attack_time > self.attack_cooldown:
             # trigger attack animation
             self.frame = 0
             self.attacking = True
@@ -160,7 +160,7 @@ class Player(Entity):
         self.in_combat = True
 
         # does not dash unless time elapsed exceeds cooldown
-        if not pygame.time.get_ticks() - self.dash_time > self.dash_cooldown:
+        if not self.game.get_ticks() - self.dash_time > self.dash_cooldown:
             return
 
         # trigger dash animation
@@ -180,7 +180,7 @@ class Player(Entity):
             self.velocity = self.acceleration
 
             # resets dash time for dash duration
-            self.dash_time = pygame.time.get_ticks()
+            self.dash_time = self.game.get_ticks()
 
             # creates dust trail
             dust_pos = self.hitbox.midbottom
@@ -218,7 +218,7 @@ class Player(Entity):
                     if self.frame == len(self.animation_frames[self.facing][casting_action]):
                         self.frame = 0
                         self.cast_phase += 1
-                        self.cast_time = pygame.time.get_ticks()
+                        self.cast_time = self.game.get_ticks()
 
                         if self.cast_phase >= len(self.cast_phases):
                             self.cast_phase = 0
@@ -226,7 +226,7 @@ class Player(Entity):
                 # holding staff phase
                 case 1:
                     # casting phase 1 continuously loops until duration is met
-                    if pygame.time.get_ticks() - self.cast_time > spell.cast_duration:
+                    if self.game.get_ticks() - self.cast_time > spell.cast_duration:
                         self.frame = 0
                         self.cast_phase += 1
 
@@ -313,7 +313,7 @@ class Player(Entity):
 
         # clears pierce and cooldown after animation ends
         if self.frame == len(self.animation_frames[self.facing]['attack']):
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = self.game.get_ticks()
             self.targets_hit.clear()
 
             self.in_combat = False
@@ -372,8 +372,8 @@ class Player(Entity):
                     )
 
         # stop dash after duration
-        if pygame.time.get_ticks() - self.dash_time > self.dash_duration:
-            self.dash_time = pygame.time.get_ticks()
+        if self.game.get_ticks() - self.dash_time > self.dash_duration:
+            self.dash_time = self.game.get_ticks()
             self.targets_hit.clear()
 
             self.in_combat = False
@@ -17,7 +17,7 @@ class Projectile(Entity):
 
         # fade
         self.fade = True
-        self.fade_time = pygame.time.get_ticks()
+        self.fade_time = self.game.get_ticks()
         self.fade_cooldown = 300
 
         # attack
@@ -54,6 +54,9 @@ class Projectile(Entity):
 
             self.image = pygame.transform.flip(self.image, False, True)
 
+            # rotated images are larger than the animation frames
+            self.game.camera_group.relocate(self)
+
     def set_target(self, coords: list, stats: Stats, target_group):
         self.stats = stats
         self.target_group = target_group
@@ -146,7 +149,7 @@ class Projectile(Entity):
     def expire(self):
         '''Fades particle after its fade time
            Deletes the particle if it has no alpha'''
-        if pygame.time.get_ticks() - self.fade_time > self.fade_cooldown:
+        if self.game.get_ticks() - self.fade_time > self.fade_cooldown:
             self.alpha -= 8
             if self.alpha < 0 or not self.fade:
                 self.kill()
@@ -169,12 +172,15 @@ class Projectile(Entity):
 
             # determines whether the animation cooldown is over
             if (self.animation_cooldown
-                    and pygame.time.get_ticks() - self.animation_time > self.animation_cooldown):
+                    and self.game.get_ticks() - self.animation_time > self.animation_cooldown):
 
-                self.animation_time = pygame.time.get_ticks()
+                self.animation_time = self.game.get_ticks()
                 self.frame += 1
-        
-        self.image.set_alpha(self.alpha)
+
+        # fades a copy since frames are shared between sprites
+        if self.alpha < 255:
+            self.image = self.image.copy()
+            self.image.set_alpha(self.alpha)
 
     def update(self):
         self.movement()
@@ -195,9 +201,7 @@ class SunCharge(Projectile):
         self.set_animation('projectiles/sun_charge', isFolder=True)
 
         # light
-        self.draw_light = True
-        self.light_color = Color.GOLD
-        self.light_radius = 20
+        self.set_light(Color.GOLD, 20)
 
     def kill(self):
         super().kill()
@@ -240,9 +244,7 @@ class Fireball(Projectile):
         self.set_animation('projectiles/fireball', isFolder=True)
 
         # light
-        self.draw_light = True
-        self.light_color = Color.GOLD
-        self.light_radius = 30
+        self.set_light(Color.GOLD, 30)
 
     def kill(self):
         # leaves explosion on death
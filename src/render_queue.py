@@ -0,0 +1,81 @@
+from constants import *
+from collections import Counter
+from weakref import WeakKeyDictionary
+
+import pygame
+
+
+class RenderQueue:
+    def __init__(self, surface: pygame.Surface):
+        '''Collects blits onto a surface to be drawn in one batched call'''
+        self.surface = surface
+        self.commands = []
+
+        # images are drawn scaled when the surface is below screen resolution
+        self.scale = 1
+        self.scaled_images = WeakKeyDictionary()
+
+        # sizes and formats of drawn surfaces that are not in the display format
+        self.mismatches = Counter()
+
+    def set_surface(self, surface: pygame.Surface, scale: float):
+        '''Draws onto a new surface at a new scale'''
+        self.surface = surface
+        if scale != self.scale:
+            self.scale = scale
+            self.scaled_images.clear()
+
+    def get_scaled_image(self, image: pygame.Surface) -> pygame.Surface:
+        '''Returns the image scaled once and reused while the image exists'''
+        scaled_image = self.scaled_images.get(image)
+        if scaled_image is None:
+            scaled_image = pygame.transform.scale(image, (
+                round(image.get_width() * self.scale),
+                round(image.get_height() * self.scale)
+            ))
+
+            self.scaled_images[image] = scaled_image
+
+        # keeps the transparency of fading images
+        scaled_image.set_alpha(image.get_alpha())
+        return scaled_image
+
+    def blit(self, image: pygame.Surface, coords):
+        '''Queues an image to be drawn at coords'''
+        self.commands.append((image, coords))
+
+    def count_mismatches(self):
+        for image, coords in self.commands:
+            if not is_display_format(image):
+                self.mismatches[(
+                    image.get_size(),
+                    image.get_bitsize(),
+                    image.get_masks()
+                )] += 1
+
+    def report(self) -> str:
+        '''Lists the most frequently drawn surfaces that are converted per blit'''
+        return '\n'.join(
+            f'{count} blits of {size} surfaces with {bitsize} bits and masks {masks}'
+            for (size, bitsize, masks), count in self.mismatches.most_common(20)
+        ) or 'every drawn surface is in the display format'
+
+    def flush(self):
+        '''Draws all queued images in the order they were queued'''
+        if not self.commands:
+            return
+
+        if FORMAT_REPORT:
+            self.count_mismatches()
+
+        if self.scale != 1:
+            self.commands = [
+                (
+                    self.get_scaled_image(image),
+                    (coords[0] * self.scale, coords[1] * self.scale)
+                )
+                for image, coords in self.commands
+            ]
+
+        self.surface.blits(self.commands, doreturn=False)
+        self.commands.clear()
@@ -0,0 +1,65 @@
+class ResolutionScaler:
+    def __init__(self, frame_budget: float, scales=(1, 0.75, 0.5)):
+        '''Lowers the world render scale when frames exceed their time budget'''
+        self.frame_budget = frame_budget
+        self.scales = scales
+        self.scale_index = 0
+
+        # smoothed frame time in milliseconds
+        self.frame_time = frame_budget
+        self.smoothing = 0.1
+
+        # hysteresis prevents the scale from flickering between levels
+        self.lower_threshold = frame_budget * 1.1
+        self.raise_threshold = frame_budget * 0.9
+        self.lower_delay = 30
+        self.raise_delay = 180
+
+        self.frames_over = 0
+        self.frames_under = 0
+
+    @property
+    def scale(self) -> float:
+        return self.scales[self.scale_index]
+
+    def get_raised_frame_time(self) -> float:
+        '''Estimates the frame time at the next higher scale'''
+        if not self.scale_index:
+            return self.frame_time
+
+        # render cost grows with the number of pixels
+        ratio = self.scales[self.scale_index - 1] / self.scale
+        return self.frame_time * ratio ** 2
+
+    def update(self, frame_time: float) -> bool:
+        '''Records the frame time and returns whether the scale has changed'''
+        self.frame_time += (frame_time - self.frame_time) * self.smoothing
+
+        # counts consecutive frames beyond each threshold
+        self.frames_over = self.frames_over + 1 \
+            if self.frame_time > self.lower_threshold else 0
+
+        self.frames_under = self.frames_under + 1 \
+            if self.get_raised_frame_time() < self.raise_threshold else 0
+
+        # lowers resolution when frames are consistently too slow
+        if (self.frames_over > self.lower_delay
+                and self.scale_index < len(self.scales) - 1):
+
+            self.scale_index += 1
+            self.reset()
+            return True
+
+        # raises resolution when frames are consistently fast enough
+        if self.frames_under > self.raise_delay and self.scale_index > 0:
+            self.scale_index -= 1
+            self.reset()
+            return True
+
+        return False
+
+    def reset(self):
+        '''Restarts measurements after the scale changes'''
+        self.frame_time = self.frame_budget
+        self.frames_over = 0
+        self.frames_under = 0
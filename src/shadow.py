@@ -1,34 +1,97 @@
 from constants import *
+from disk_cache import DiskCache
 
 import pygame
+import struct
 
 
 class Shadow:
-    def __init__(self, color, image):
-        # creates shadow from image polygon outline
-        points = []
-        mask_outline = pygame.mask.from_surface(image).outline()
-
-        for x, y in mask_outline:
-            shadow_height = (image.get_height() - y) * 0.5
-            shadow_width = shadow_height * math.tan(math.pi / 3)
-            points.append((x + shadow_width, y + shadow_height))
-
-        # zips coords into its separate x's and y's
-        x, y = zip(*points)
-
-        # determines bounds of rect
-        min_x, min_y, max_x, max_y = min(x), min(y), max(x), max(y)
-
-        # draws polygon onto surface for color
-        target_rect = pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
-        self.surface = pygame.Surface(target_rect.size, pygame.SRCALPHA)
-
-        if len(points) > 2:
-            pygame.draw.polygon(
-                self.surface,
-                color,
-                [(x - min_x, y - min_y) for x, y in points]
+    # bump when the shadow shape changes to invalidate cached shadows
+    version = 4
+    cache = DiskCache(f'{CACHE_PATH}/shadows', DISK_CACHE, DISK_CACHE_BUDGET)
+
+    def __init__(self, color, image, key: tuple):
+        self.set_surface(color, self.get_surface(color, image, key))
+
+    @classmethod
+    def from_surface(cls, color, surface: pygame.Surface):
+        '''Creates the shadow from a surface returned by get_surface'''
+        shadow = cls.__new__(cls)
+        shadow.set_surface(color, surface)
+
+        return shadow
+
+    def set_surface(self, color, surface: pygame.Surface):
+        # silhouettes are cast opaque and faded as a whole
+        self.surface = optimize_surface(surface, 'binary')
+        self.surface.set_alpha(color[3])
+
+    @classmethod
+    def get_surface(cls, color, image, key: tuple) -> pygame.Surface:
+        '''Returns the opaque shadow of the image from the disk cache or casts it
+           The key names the frame by asset path, size, flip and index'''
+        color = (*color[:3], 255)
+
+        # frames are named instead of hashed so cached shadows skip the silhouette
+        # and any change to an image file changes the signature of the images
+        key = cls.cache.get_key(cls.version, IMAGES.signature, color, *key)
+
+        # cached shadows are stored as their size followed by rgba pixels
+        data = cls.cache.get(key)
+        if data:
+            size = struct.unpack_from('<II', data)
+            return pygame.image.frombytes(data[8:], size, 'RGBA')
+
+        silhouette = pygame.mask.from_surface(image).to_surface(
+            setcolor=color,
+            unsetcolor=(0, 0, 0, 0)
+        )
+
+        surface = cls.cast(silhouette)
+        cls.cache.set(
+            key,
+            struct.pack('<II', *surface.get_size())
+            + pygame.image.tobytes(surface, 'RGBA')
+        )
+
+        return surface
+
+    @staticmethod
+    def get_extent(size) -> tuple:
+        '''Returns the largest size of a shadow cast from an image of the size'''
+        width, height = size
+        lean = math.tan(math.pi / 3)
+
+        return (
+            width + math.ceil(height * lean / 2) + 1,
+            math.ceil(height / 2)
+        )
+
+    @staticmethod
+    def cast(silhouette: pygame.Surface) -> pygame.Surface:
+        '''Shears the silhouette along the ground'''
+        width, height = silhouette.get_size()
+
+        # shadows are half as tall and lean further right towards the top
+        silhouette = pygame.transform.scale(
+            silhouette,
+            (width, math.ceil(height / 2))
+        )
+
+        lean = math.tan(math.pi / 3)
+        surface = pygame.Surface(
+            (width + math.ceil(height * lean / 2), silhouette.get_height()),
+            pygame.SRCALPHA
+        )
+
+        # shears one row at a time
+        surface.blits([
+            (
+                silhouette,
+                (round((silhouette.get_height() - y) * lean), y),
+                (0, y, width, 1)
             )
+            for y in range(silhouette.get_height())
+        ], doreturn=False)
 
-        self.surface.convert_alpha()
+        return surface.subsurface(surface.get_bounding_rect()).copy()
@@ -0,0 +1,65 @@
+import pygame
+
+
+class SpatialGrid:
+    def __init__(self, cell_size: int):
+        '''Buckets sprites into uniform cells to find sprites near a rect'''
+        self.cell_size = cell_size
+
+        # sprites in each cell and the range of cells each sprite spans
+        self.cells = {}
+        self.sprite_cells = {}
+
+    def get_cell_range(self, rect: pygame.Rect):
+        '''Returns the first and last column and row covered by the rect'''
+        return (
+            rect.left // self.cell_size,
+            rect.top // self.cell_size,
+            max(rect.right - 1, rect.left) // self.cell_size,
+            max(rect.bottom - 1, rect.top) // self.cell_size
+        )
+
+    def get_cells(self, cell_range: tuple):
+        left, top, right, bottom = cell_range
+        for row in range(top, bottom + 1):
+            for column in range(left, right + 1):
+                yield column, row
+
+    def insert(self, sprite, rect: pygame.Rect):
+        '''Adds or moves the sprite into the cells covered by the rect'''
+        cell_range = self.get_cell_range(rect)
+
+        # does not rebucket unless the sprite has crossed into other cells
+        if self.sprite_cells.get(sprite) == cell_range:
+            return
+
+        self.remove(sprite)
+        self.sprite_cells[sprite] = cell_range
+
+        for cell in self.get_cells(cell_range):
+            if cell not in self.cells:
+                self.cells[cell] = set()
+
+            self.cells[cell].add(sprite)
+
+    def remove(self, sprite):
+        '''Removes the sprite from all cells'''
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+
+        for cell in self.get_cells(cell_range):
+            self.cells[cell].discard(sprite)
+
+            # deletes empty cells
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def query(self, rect: pygame.Rect) -> set:
+        '''Returns all sprites in the cells covered by the rect'''
+        sprites = set()
+        for cell in self.get_cells(self.get_cell_range(rect)):
+            if cell in self.cells:
+                sprites.update(self.cells[cell])
+
+        return sprites
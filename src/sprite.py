@@ -1,5 +1,5 @@
 from constants import *
-from shadow import Shadow
+from frame_cache import FRAMES
 
 import pygame
 from copy import deepcopy
@@ -13,6 +13,10 @@ class Sprite(pygame.sprite.Sprite):
         self.coords = pygame.math.Vector2(*coords)
         self.size = pygame.math.Vector2(*size)
 
+        # coords before the last tick the sprite moved in for interpolation
+        self.previous_coords = pygame.math.Vector2(self.coords)
+        self.moved_tick = -1
+
         # images and rects
         self.image = pygame.Surface(size)
         self.rect = self.image.get_rect(center=coords)
@@ -27,6 +31,9 @@ class Sprite(pygame.sprite.Sprite):
         self.facing = 'right'
         self.sprite_layer = 0
 
+        # randomly sized sprites round their size to share frames
+        self.round_size = False
+
         # animation
         self.frame = 0
         self.loop_frames = True
@@ -37,7 +44,7 @@ class Sprite(pygame.sprite.Sprite):
         }
 
         # animation cooldowns
-        self.animation_time = pygame.time.get_ticks()
+        self.animation_time = self.game.get_ticks()
         self.animation_cooldown = 0
 
         # masks
@@ -54,45 +61,20 @@ class Sprite(pygame.sprite.Sprite):
         self.light_color = None
         self.light_radius = 0
 
+        # spatial index
+        self.game.camera_group.relocate(self)
+
     def get_images(self, filepath: str, isFolder=False, flipped=False):
-        images = []
-        shadows = []
-
-        if isFolder:
-            # sorts filenames by length and then alphabetically
-            filepaths = os.listdir(f'{SPRITE_PATH}/{filepath}')
-            filepaths.sort(key=lambda filename: (len(filename), filename))
-
-            for path in filepaths:
-                filename = path[:-4].split('/')[-1]
-                image = IMAGES[filename].copy()
-                image = pygame.transform.scale(
-                    image,
-                    self.size
-                )
-
-                if flipped:
-                    # flips image over y-axis
-                    image = pygame.transform.flip(image, True, False)
-
-                # creates image and shadow
-                images.append(image)
-                if self.draw_shadow:
-                    shadows.append(Shadow((0, 0, 0, 50), image))
-
-        else:
-            # filepath is a single image instead of a sprite folder
-            filename = filepath.split('/')[-1]
-            image = IMAGES[filename].copy()
-            image = pygame.transform.scale(image, self.size)
-
-            if flipped:
-                # flips image over y-axis
-                image = pygame.transform.flip(image, True, False)
-
-            images.append(image)
-            if self.draw_shadow:
-                shadows.append(Shadow((0, 0, 0, 50), image))
+        '''Returns the shared frames and shadows of the asset at the sprite size'''
+        images = FRAMES.get_frames(
+            filepath, self.size, isFolder, flipped, self.round_size
+        )
+
+        shadows = ()
+        if self.draw_shadow:
+            shadows = FRAMES.get_shadows(
+                filepath, self.size, isFolder, flipped, self.round_size
+            )
 
         return images, shadows
 
@@ -115,12 +97,32 @@ class Sprite(pygame.sprite.Sprite):
         if self.draw_shadow:
             self.shadow = self.shadow_frames[self.facing][self.frame]
 
+        # frame sizes may be rounded so the rect is fitted to the image
+        self.rect.size = self.image.get_size()
+        self.rect.center = self.coords
+
+        self.game.camera_group.relocate(self)
+
     def set_coords(self, x: float, y: float):
+        # remembers where the sprite started the tick
+        if self.moved_tick != self.game.ticks:
+            self.moved_tick = self.game.ticks
+            self.previous_coords.xy = self.coords
+
         self.coords.xy = x, y
         self.rect.center = self.coords
         self.hitbox.center = self.coords + self.hitbox_offset
         self.collision_box.center = self.coords + self.collision_box_offset
 
+        self.game.camera_group.relocate(self)
+
+    def set_light(self, color: tuple, radius: int):
+        self.draw_light = True
+        self.light_color = color
+        self.light_radius = radius
+
+        self.game.camera_group.relocate(self)
+
     def set_hitbox(self, width: float, height: float, offsetx= 0.0, offsety=0.0):
         self.hitbox = self.rect.scale_by(width, height)
         self.hitbox_offset.xy = offsetx * self.rect.width, offsety * self.rect.height
@@ -149,9 +151,9 @@ class Sprite(pygame.sprite.Sprite):
 
             # determines whether the animation cooldown is over
             if (self.animation_cooldown
-                    and pygame.time.get_ticks() - self.animation_time > self.animation_cooldown):
+                    and self.game.get_ticks() - self.animation_time > self.animation_cooldown):
 
-                self.animation_time = pygame.time.get_ticks()
+                self.animation_time = self.game.get_ticks()
                 self.frame += 1
 
     def draw(self, surface):
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class SurfaceCache:
+    def __init__(self, budget: int):
+        '''Keeps surfaces until over the byte budget and then evicts the least
+           recently used first'''
+        self.budget = budget
+        self.bytes = 0
+
+        # values ordered from least to most recently used and their bytes
+        self.values = OrderedDict()
+        self.sizes = {}
+
+    @staticmethod
+    def get_bytes(*surfaces: pygame.Surface) -> int:
+        '''Returns the bytes of pixel data in the surfaces'''
+        return sum(surface.get_pitch() * surface.get_height() for surface in surfaces)
+
+    def get(self, key):
+        '''Returns the value and marks it most recently used or None if missing'''
+        if key not in self.values:
+            return None
+
+        self.values.move_to_end(key)
+        return self.values[key]
+
+    def set(self, key, value, size: int):
+        self.pop(key)
+
+        self.values[key] = value
+        self.sizes[key] = size
+        self.bytes += size
+
+    def grow(self, key, size: int):
+        '''Counts more bytes kept alongside the value'''
+        self.sizes[key] += size
+        self.bytes += size
+
+    def pop(self, key):
+        value = self.values.pop(key, None)
+        if value is not None:
+            self.bytes -= self.sizes.pop(key)
+
+        return value
+
+    def evict(self, keep=1) -> list:
+        '''Evicts least recently used values over the budget except the last few
+           Returns the keys of the evicted values'''
+        evicted = []
+        while self.bytes > self.budget and len(self.values) > keep:
+            key, value = self.values.popitem(last=False)
+            self.bytes -= self.sizes.pop(key)
+            evicted.append(key)
+
+        return evicted
+
+    def clear(self):
+        self.values.clear()
+        self.sizes.clear()
+        self.bytes = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self.values
+
+    def __len__(self) -> int:
+        return len(self.values)
@@ -0,0 +1,96 @@
+from constants import *
+from collections import OrderedDict
+
+import pygame
+
+
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, color: tuple, characters: str):
+        '''Renders each character once side by side onto one surface'''
+        glyphs = [font.render(character, True, color) for character in characters]
+
+        self.surface = pygame.Surface(
+            (
+                sum(glyph.get_width() for glyph in glyphs),
+                max(glyph.get_height() for glyph in glyphs)
+            ),
+            pygame.SRCALPHA
+        )
+
+        # area of each character within the atlas
+        self.rects = {}
+
+        x = 0
+        for character, glyph in zip(characters, glyphs):
+            self.rects[character] = self.surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+    def can_render(self, text: str) -> bool:
+        return all(character in self.rects for character in text)
+
+    def render(self, text: str) -> pygame.Surface:
+        '''Composes the text from glyphs without rasterizing the font'''
+        rects = [self.rects[character] for character in text]
+        surface = pygame.Surface(
+            (sum(rect.width for rect in rects), self.surface.get_height()),
+            pygame.SRCALPHA
+        )
+
+        x = 0
+        blits = []
+        for rect in rects:
+            blits.append((self.surface, (x, 0), rect))
+            x += rect.width
+
+        surface.blits(blits, doreturn=False)
+        return surface
+
+
+class TextCache:
+    def __init__(self, fonts: dict, capacity: int, characters: str):
+        '''Keeps the most recently rendered strings and glyphs to compose numbers'''
+        self.fonts = fonts
+        self.capacity = capacity
+        self.characters = characters
+
+        # glyph atlases keyed by font size and color
+        self.atlases = {}
+
+        # rendered strings ordered from least to most recently used
+        self.texts = OrderedDict()
+
+    def get_atlas(self, font_size: int, color: tuple) -> GlyphAtlas:
+        key = font_size, color
+        if key not in self.atlases:
+            self.atlases[key] = GlyphAtlas(
+                self.fonts[font_size],
+                color,
+                self.characters
+            )
+
+        return self.atlases[key]
+
+    def render(self, text: str, font_size: int, color: tuple) -> pygame.Surface:
+        '''Returns the rendered text which is shared and must not be modified'''
+        key = text, font_size, tuple(color)
+        if key in self.texts:
+            self.texts.move_to_end(key)
+            return self.texts[key]
+
+        # numbers are composed from glyphs instead of rasterized
+        atlas = self.get_atlas(font_size, tuple(color))
+        if text and atlas.can_render(text):
+            image = atlas.render(text)
+
+        else:
+            image = self.fonts[font_size].render(text, True, color)
+
+        self.texts[key] = image
+        if len(self.texts) > self.capacity:
+            self.texts.popitem(last=False)
+
+        return image
+
+
+# rendered text shared across all sprites and interfaces
+TEXT = TextCache(COMICORO, TEXT_CACHE_SIZE, TEXT_GLYPHS)
@@ -65,27 +65,26 @@ class Torch(Sprite):
 
         # render
         self.sprite_layer = 4
+        self.round_size = True
 
         # animation
         self.animation_cooldown = 125
         self.set_animation('decor/animated/torch', isFolder=True)
 
         # smoke
-        self.smoke_time = pygame.time.get_ticks()
+        self.smoke_time = self.game.get_ticks()
         self.smoke_cooldown = randomize(500, 0.2)
 
         # light
-        self.draw_light = True
-        self.light_radius = 50
-        self.light_color = Color.GOLD
+        self.set_light(Color.GOLD, 50)
 
     def draw_smoke(self):
         "Creates smoke every interval"
         # does not draw smoke unless time elapsed exceeds cooldown
-        if not pygame.time.get_ticks() - self.smoke_time > self.smoke_cooldown:
+        if not self.game.get_ticks() - self.smoke_time > self.smoke_cooldown:
             return
             
-        self.smoke_time = pygame.time.get_ticks()
+        self.smoke_time = self.game.get_ticks()
         smoke_pos = list(self.hitbox.midtop)
         smoke_pos[0] += random.randint(
             width := -self.hitbox.width // 4,
@@ -308,3 +307,64 @@ class LevelExit(Sprite):
     def update(self):
         self.transition_level()
         self.animation()
+
+
+class StaticBatch(Sprite):
+    def __init__(self, sprites: list, game, groups):
+        # pre-renders stationary sprites and their shadows onto one surface
+        sprites = sorted(sprites, key=lambda sprite: sprite.hitbox.bottom)
+
+        # gets (image, coords) of every shadow and sprite
+        layers = []
+        for sprite in sprites:
+            if sprite.draw_shadow:
+                shadow = sprite.shadow_frames[sprite.facing][0].surface
+                shadow_pos = shadow.get_rect(
+                    bottomleft=sprite.hitbox.bottomleft
+                ).topleft
+
+                layers.append((shadow, shadow_pos))
+
+            image = sprite.animation_frames[sprite.facing][0]
+            layers.append((image, sprite.rect.topleft))
+
+        bounds = pygame.Rect(layers[0][1], layers[0][0].get_size())
+        bounds.unionall_ip([
+            pygame.Rect(coords, image.get_size())
+            for image, coords in layers
+        ])
+
+        super().__init__(bounds.center, bounds.size, game, groups)
+
+        # render
+        self.sprite_layer = sprites[0].sprite_layer
+        self.image = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for image, coords in layers:
+            self.image.blit(image, (
+                coords[0] - bounds.left,
+                coords[1] - bounds.top
+            ))
+
+        # faded shadows make the batch translucent while keyed or opaque
+        # sprites alone keep it binary so it is not classified pixel by pixel
+        alpha_type = None
+        if any(sprite.draw_shadow for sprite in sprites):
+            alpha_type = 'translucent'
+
+        elif not any(image.get_flags() & pygame.SRCALPHA for image, coords in layers):
+            alpha_type = 'binary'
+
+        self.image = optimize_surface(self.image, alpha_type)
+
+        # sorts in front of sprites behind every baked sprite
+        self.hitbox = pygame.Rect(
+            bounds.left,
+            bounds.top,
+            bounds.width,
+            sprites[-1].hitbox.bottom - bounds.top
+        )
+
+        self.game.camera_group.relocate(self)
+
+    def update(self):
+        pass
@@ -0,0 +1,27 @@
+import time
+
+
+class Timeline:
+    def __init__(self):
+        '''Records the milliseconds spent in each phase of startup'''
+        self.start = self.last_mark = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase: str):
+        '''Ends the phase that began at the previous mark'''
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def get_total(self) -> float:
+        return (self.last_mark - self.start) * 1000
+
+    def report(self) -> str:
+        width = max(len(phase) for phase, duration in self.phases)
+        lines = [
+            f'{phase:<{width}} {duration:>8.1f} ms'
+            for phase, duration in self.phases
+        ]
+
+        lines.append(f"{'total':<{width}} {self.get_total():>8.1f} ms")
+        return '\n'.join(lines)
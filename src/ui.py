@@ -1,5 +1,6 @@
 from constants import *
 from sprite import Sprite
+from text_cache import TEXT
 
 import pygame
 
@@ -213,7 +214,7 @@ class Text(Sprite):
         )
 
     def set_text(self, text, font_size, color):
-        self.image = COMICORO[font_size].render(text, True, color)
+        self.image = TEXT.render(text, font_size, color)
         self.rect = self.image.get_rect(center=self.coords)
 
         background_size = self.rect.width + 15, self.rect.height + 10
@@ -250,12 +251,7 @@ class PlayerBar(Sprite):
         # bar rect
         self.bar_color = Color.BLACK
         self.bar_width = self.rect.width
-        self.bar_rect = pygame.Rect(
-            self.rect.left,
-            self.rect.top,
-            self.bar_width,
-            self.rect.height
-        )
+        self.bar_rect = pygame.Rect(0, 0, self.bar_width, self.rect.height)
 
         # bar background
         self.background_surface = pygame.Surface((
@@ -269,28 +265,57 @@ class PlayerBar(Sprite):
             128
         )
 
-        # text
-        self.bar_text = COMICORO[35].render(str(""), True, Color.CREAM)
+        # composed bar is only redrawn when its value changes
+        self.value = None
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.dirty = True
 
-    def render(self):
+    def get_value(self) -> tuple:
+        '''Returns the current and maximum value shown by the bar'''
+        return 0, 1
+
+    def compose(self):
+        '''Draws the background, bar, frame and text onto the bar surface'''
+        value, max_value = self.value
+        ratio = value / max_value
+        if ratio > 1:
+            ratio = 1
+
+        self.bar_rect.width = self.bar_width * ratio
+        bar_text = TEXT.render(str(value), 35, Color.CREAM)
         text_pos = (
-            self.rect.x + self.bar_width / 2 - self.bar_text.get_width() / 2,
-            self.rect.y + self.rect.height / 2 - self.bar_text.get_height() / 2
+            self.bar_width / 2 - bar_text.get_width() / 2,
+            self.rect.height / 2 - bar_text.get_height() / 2
         )
 
-        self.screen.blit(self.background_surface, self.rect.topleft)
+        self.surface.fill((0, 0, 0, 0))
+        self.surface.blit(self.background_surface, (0, 0))
 
         pygame.draw.rect(
-            self.screen,
+            self.surface,
             self.bar_color,
             self.bar_rect
         )
 
-        self.screen.blit(self.image, self.rect.topleft)
-        self.screen.blit(self.bar_text, text_pos)
+        self.surface.blit(self.image, (0, 0))
+        self.surface.blit(bar_text, text_pos)
+
+    def render(self):
+        '''Draws the bar and returns its rect if it has changed'''
+        dirty_rect = None
+        if self.dirty:
+            self.value = self.get_value()
+            self.compose()
+
+            self.dirty = False
+            dirty_rect = self.rect
+
+        self.screen.blit(self.surface, self.rect.topleft)
+        return dirty_rect
 
     def update(self):
-        pass
+        if self.get_value() != self.value:
+            self.dirty = True
 
 
 class PlayerHealthBar(PlayerBar):
@@ -315,17 +340,9 @@ class PlayerHealthBar(PlayerBar):
             128
         )
 
-    def update(self):
-        ratio = self.game.player.stats.health / self.game.player.stats.base_health
-        if ratio > 1:
-            ratio = 1
-
-        self.bar_rect.width = self.bar_width * ratio
-        self.bar_text = COMICORO[35].render(
-            str(self.game.player.stats.health),
-            True,
-            Color.CREAM
-        )
+    def get_value(self) -> tuple:
+        stats = self.game.player.stats
+        return stats.health, stats.base_health
 
 
 class PlayerManaBar(PlayerBar):
@@ -350,14 +367,6 @@ class PlayerManaBar(PlayerBar):
             128
         )
 
-    def update(self):
-        ratio = self.game.player.stats.mana / self.game.player.stats.base_mana
-        if ratio > 1:
-            ratio = 1
-
-        self.bar_rect.width = self.bar_width * ratio
-        self.bar_text = COMICORO[35].render(
-            str(self.game.player.stats.mana),
-            True,
-            Color.CREAM
-        )
+    def get_value(self) -> tuple:
+        stats = self.game.player.stats
+        return stats.mana, stats.base_mana
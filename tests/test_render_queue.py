@@ -0,0 +1,98 @@
+import os
+import sys
+
+import pytest
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# the game reads assets relative to src and must not open a window
+os.environ['NOVORUS_HEADLESS'] = '1'
+os.environ['NOVORUS_DISK_CACHE'] = '0'
+sys.path.insert(0, SRC_PATH)
+
+import pygame
+
+
+@pytest.fixture(scope='module')
+def game():
+    cwd = os.getcwd()
+    os.chdir(SRC_PATH)
+
+    import app
+    game = app.App((320, 180))
+
+    # draws a few frames so the ground and animations are in place
+    for i in range(3):
+        game.draw()
+        game.update()
+
+    yield game
+    os.chdir(cwd)
+
+
+def render(game):
+    game.screen.fill((0, 0, 0))
+    game.camera_group.render()
+
+    return pygame.image.tobytes(game.screen, 'RGB')
+
+
+def render_reference(game):
+    '''Draws the frame with one blit at a time in the order the camera drew
+       before blits were queued: ground chunks, then the shadow and image of
+       each sprite sorted by sprite layer and hitbox bottom, then lighting'''
+    camera_group = game.camera_group
+    screen = game.screen
+    offset = camera_group.offset
+
+    screen.fill((0, 0, 0))
+
+    view = pygame.Rect(offset, game.resolution)
+    for chunk, coords in game.level.ground.visible_chunks(view):
+        screen.blit(chunk, coords - offset)
+
+    visible_sprites = camera_group.get_visible_sprites()
+    for sprite in sorted(
+        [sprite for sprite in camera_group.sprites() if sprite in visible_sprites],
+        key=lambda sprite: (sprite.sprite_layer, sprite.hitbox.bottom)
+    ):
+        if sprite.draw_shadow and sprite.shadow:
+            shadow_pos = sprite.hitbox.bottomleft - offset
+            shadow_pos.y -= sprite.shadow.surface.get_height()
+            screen.blit(sprite.shadow.surface, shadow_pos)
+
+        screen.blit(sprite.image, sprite.rect.topleft - offset)
+
+    camera_group.draw_lighting(visible_sprites)
+
+    return pygame.image.tobytes(screen, 'RGB')
+
+
+def test_flush_keeps_queued_order():
+    from render_queue import RenderQueue
+
+    surface = pygame.Surface((4, 1))
+    queue = RenderQueue(surface)
+    for color in ((255, 0, 0), (0, 255, 0), (0, 0, 255)):
+        image = pygame.Surface((2, 1))
+        image.fill(color)
+        queue.blit(image, (1, 0))
+
+    queue.flush()
+
+    assert not queue.commands
+    assert surface.get_at((1, 0))[:3] == (0, 0, 255)
+    assert surface.get_at((0, 0))[:3] == (0, 0, 0)
+
+
+def test_render_matches_reference(game):
+    assert render(game) == render_reference(game)
+
+
+def test_render_matches_reference_in_the_dark(game):
+    game.level.ambient_darkness = 150
+    try:
+        assert render(game) == render_reference(game)
+
+    finally:
+        game.level.ambient_darkness = 0